@@ -1,3 +1,4 @@
+import time
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
@@ -6,52 +7,111 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
 from app.db.models import User, StudySession
-from app.core.security import verify_access_token, InvalidTokenError
+from app.core.auth_cache import get_auth_cache
+from app.core.security import decode_access_token, InvalidTokenError
 from app.services.auth import AuthService
 from app.services.session import SessionService
+from app.config import get_settings
+
+settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Dependency to get the current authenticated user."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        user_id = verify_access_token(token)
-    except InvalidTokenError:
-        raise credentials_exception
 
-    user = await AuthService.get_user_by_id(db, UUID(user_id))
-    if not user:
-        raise credentials_exception
+def _inactive_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Inactive user",
+    )
 
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
-        )
 
+async def get_current_user_id(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> UUID:
+    """Dependency to get the ID of the current authenticated, active user.
+
+    Decoded tokens and active users are cached (see AuthCache), so this
+    usually runs no query.
+    """
+    cache = get_auth_cache()
+    cached = cache.tokens.get(token)
+    if cached is None:
+        try:
+            payload = decode_access_token(token)
+            user_id = UUID(payload["sub"])
+        except (InvalidTokenError, ValueError):
+            raise _credentials_exception()
+        vouched = settings.AUTH_ACTIVE_CLAIM and payload.get("active") is True
+        cache.tokens.set(token, (user_id, vouched), ttl_seconds=payload["exp"] - time.time())
+    else:
+        user_id, vouched = cached
+
+    if not vouched and not cache.active_users.get(user_id):
+        user = await AuthService.get_user_by_id(db, user_id)
+        if not user:
+            raise _credentials_exception()
+        if not user.is_active:
+            raise _inactive_exception()
+        cache.active_users.set(user_id, True)
+
+    return user_id
+
+
+async def get_current_user(
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Dependency to get the current user's row, for routes that need more than the ID."""
+    user = await AuthService.get_user_by_id(db, user_id)
+    if not user:
+        raise _credentials_exception()
+    if not user.is_active:
+        get_auth_cache().forget_user(user_id)
+        raise _inactive_exception()
     return user
 
 
+def _session_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Session not found",
+    )
+
+
+async def get_owned_session_id(
+    session_id: UUID,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> UUID:
+    """Dependency to verify session ownership without loading the session.
+
+    Ownership is cached, so this usually runs no query.
+    """
+    cache = get_auth_cache()
+    if not cache.session_owners.get((user_id, session_id)):
+        if not await SessionService.is_session_owner(db, session_id, user_id):
+            raise _session_not_found()
+        cache.session_owners.set((user_id, session_id), True)
+    return session_id
+
+
 async def get_session_for_user(
     session_id: UUID,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> StudySession:
     """Dependency to get a session and verify ownership."""
-    session = await SessionService.get_session_for_user(db, session_id, current_user.id)
+    session = await SessionService.get_session_for_user(db, session_id, user_id)
     if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Session not found",
-        )
+        raise _session_not_found()
+    get_auth_cache().session_owners.set((user_id, session_id), True)
     return session
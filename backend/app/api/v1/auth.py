@@ -15,12 +15,21 @@ from app.schemas import (
     MessageResponse,
 )
 from app.services.auth import AuthService
+from app.core.security import PasswordHasherBusy
 from app.api.deps import get_current_user
 from app.db.models import User
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
@@ -33,7 +42,10 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    return await AuthService.register_and_login(db, user_data)
+    try:
+        return await AuthService.register_and_login(db, user_data)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -42,7 +54,10 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ):
     """Authenticate user and return JWT tokens."""
-    user = await AuthService.authenticate_user(db, form_data.username, form_data.password)
+    try:
+        user = await AuthService.authenticate_user(db, form_data.username, form_data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,7 +110,10 @@ async def reset_password(
     db: AsyncSession = Depends(get_db),
 ):
     """Reset password using a valid reset token."""
-    success = await AuthService.reset_password(db, request.token, request.new_password)
+    try:
+        success = await AuthService.reset_password(db, request.token, request.new_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -110,3 +128,13 @@ async def get_current_user_info(
 ):
     """Get the current authenticated user's information."""
     return UserResponse.model_validate(current_user)
+
+
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_current_user(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Deactivate the current user's account and sign it out everywhere."""
+    await AuthService.deactivate_user(db, current_user)
+    return None
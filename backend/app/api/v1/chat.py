@@ -1,49 +1,105 @@
+import hashlib
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.db.models import User, StudySession
+from app.db.database import get_db, AsyncSessionLocal
 from app.schemas import ChatMessageCreate, ChatResponse, MessageListResponse
 from app.services.chat import ChatService
-from app.api.deps import get_current_user, get_session_for_user
+from app.services.stats import SessionStatsService
+from app.api.deps import get_current_user_id, get_owned_session_id
+from app.core.idempotency import get_idempotency_store, IdempotencyKeyConflict
+from app.core.etag import conditional_get
+from app.core.pagination import InvalidCursor
 
 router = APIRouter(tags=["Chat"])
 
 
 @router.get("/sessions/{session_id}/messages", response_model=MessageListResponse)
 async def list_messages(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    session: StudySession = Depends(get_session_for_user),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool | None = Query(
+        None, description="Count all matching rows; by default only on offset pages"
+    ),
+    session_id: UUID = Depends(get_owned_session_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Get chat history for a session."""
-    return await ChatService.list_messages(db, session.id, skip=skip, limit=limit)
+    content_version = await SessionStatsService.get_count(db, session_id, "content_version")
+    if content_version is not None:
+        not_modified = conditional_get(request, response, "messages", session_id, content_version)
+        if not_modified:
+            return not_modified
+    try:
+        return await ChatService.list_messages(
+            db,
+            session_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/sessions/{session_id}/chat", response_model=ChatResponse)
 async def send_message(
     message: ChatMessageCreate,
-    session: StudySession = Depends(get_session_for_user),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    session_id: UUID = Depends(get_owned_session_id),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Send a message and receive AI response."""
-    return await ChatService.process_message(
-        db=db,
-        session_id=session.id,
-        user_id=current_user.id,
-        content=message.content,
-    )
+    """Send a message and receive AI response.
+
+    Retries carrying the same Idempotency-Key share one generation: they
+    wait for the in-flight turn or get its stored response.
+    """
+    if idempotency_key is None:
+        return await ChatService.process_message(
+            db=db,
+            session_id=session_id,
+            user_id=user_id,
+            content=message.content,
+        )
+
+    async def work():
+        # Own session: the turn may outlive the request that started it
+        async with AsyncSessionLocal() as work_db:
+            return await ChatService.process_message(
+                db=work_db,
+                session_id=session_id,
+                user_id=user_id,
+                content=message.content,
+            )
+
+    fingerprint = hashlib.sha256(f"{session_id}:{message.content}".encode()).hexdigest()
+    try:
+        result, replayed = await get_idempotency_store().run(
+            f"{user_id}:chat:{idempotency_key}", fingerprint, work
+        )
+    except IdempotencyKeyConflict:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request",
+        )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
 
 
 @router.delete("/sessions/{session_id}/messages", status_code=204)
 async def clear_messages(
-    session: StudySession = Depends(get_session_for_user),
+    session_id: UUID = Depends(get_owned_session_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Clear all chat messages for a session."""
-    await ChatService.clear_messages(db, session.id)
+    await ChatService.clear_messages(db, session_id)
     return None
@@ -1,14 +1,39 @@
 from uuid import UUID
 import asyncio
+import hashlib
+import json
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    UploadFile,
+    File,
+    BackgroundTasks,
+    Header,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db, AsyncSessionLocal
-from app.db.models import User, StudySession
-from app.schemas import DocumentResponse, DocumentListResponse, DocumentStatusResponse
+from app.db.models import StudySession
+from app.schemas import (
+    BulkRequest,
+    BulkResult,
+    DocumentResponse,
+    DocumentListResponse,
+    DocumentStatusResponse,
+)
 from app.services.document import DocumentService
-from app.api.deps import get_current_user, get_session_for_user
+from app.api.deps import get_current_user_id, get_owned_session_id, get_session_for_user
+from app.core.etag import conditional_get
+from app.core.events import get_event_broker
+from app.core.idempotency import get_idempotency_store, IdempotencyKeyConflict
+from app.core.pagination import InvalidCursor
 from app.config import get_settings
 
 settings = get_settings()
@@ -33,6 +58,17 @@ async def process_document_background(document_id: UUID):
             print(f"Error processing document {document_id}: {e}")
 
 
+# Ingestion started outside a request's background tasks; referenced until done
+_ingestion_tasks: set[asyncio.Task] = set()
+
+
+def start_processing(document_id: UUID) -> None:
+    """Start processing a document now, independent of any request."""
+    task = asyncio.get_running_loop().create_task(process_document_background(document_id))
+    _ingestion_tasks.add(task)
+    task.add_done_callback(_ingestion_tasks.discard)
+
+
 @router.post(
     "/sessions/{session_id}/documents",
     response_model=DocumentResponse,
@@ -40,12 +76,17 @@ async def process_document_background(document_id: UUID):
 )
 async def upload_document(
     background_tasks: BackgroundTasks,
+    response: Response,
     file: UploadFile = File(...),
-    session: StudySession = Depends(get_session_for_user),
-    current_user: User = Depends(get_current_user),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    session_id: UUID = Depends(get_owned_session_id),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a document to a study session."""
+    """Upload a document to a study session.
+
+    Retries carrying the same Idempotency-Key store and ingest the file once.
+    """
     # Validate file type
     if file.content_type not in ALLOWED_MIME_TYPES:
         raise HTTPException(
@@ -63,82 +104,166 @@ async def upload_document(
             detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
         )
 
-    # Save document
-    service = DocumentService()
-    document = await service.save_uploaded_file(
-        db=db,
-        session_id=session.id,
-        user_id=current_user.id,
-        file_content=content,
-        original_filename=file.filename or "unknown",
-        mime_type=file.content_type,
-    )
+    async def save(save_db: AsyncSession) -> DocumentResponse:
+        service = DocumentService()
+        document = await service.save_uploaded_file(
+            db=save_db,
+            session_id=session_id,
+            user_id=user_id,
+            file_content=content,
+            original_filename=file.filename or "unknown",
+            mime_type=file.content_type,
+        )
+        return DocumentResponse.model_validate(document)
+
+    if idempotency_key is None:
+        document = await save(db)
+    else:
+        async def work():
+            # Own session: the upload may outlive the request that started it.
+            # Ingestion starts here too, so a request that dies after the save
+            # can't leave a document that replays never process
+            async with AsyncSessionLocal() as work_db:
+                document = await save(work_db)
+            start_processing(document.id)
+            return document
+
+        digest = hashlib.sha256(content)
+        digest.update(f"{session_id}:{file.filename}".encode())
+        try:
+            document, replayed = await get_idempotency_store().run(
+                f"{user_id}:upload:{idempotency_key}", digest.hexdigest(), work
+            )
+        except IdempotencyKeyConflict:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return document
 
     # Queue background processing
     background_tasks.add_task(process_document_background, document.id)
 
-    return DocumentResponse.model_validate(document)
+    return document
 
 
 @router.get("/sessions/{session_id}/documents", response_model=DocumentListResponse)
 async def list_documents(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool | None = Query(
+        None, description="Count all matching rows; by default only on offset pages"
+    ),
     session: StudySession = Depends(get_session_for_user),
     db: AsyncSession = Depends(get_db),
 ):
     """List all documents in a study session."""
-    return await DocumentService.list_documents(db, session.id, skip=skip, limit=limit)
+    not_modified = conditional_get(
+        request, response, "documents", session.id, session.documents_version
+    )
+    if not_modified:
+        return not_modified
+    try:
+        return await DocumentService.list_documents(
+            db,
+            session.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/sessions/{session_id}/documents/events")
+async def document_events(
+    session_id: UUID = Depends(get_owned_session_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream document status and progress events for a session (SSE).
+
+    Events arrive as they are published by whichever worker processes the
+    document. Clients should resync the document list after (re)connecting,
+    since events sent while they were away are not replayed.
+    """
+    # Hand the pooled connection back before the long-lived stream starts
+    await db.close()
+    broker = get_event_broker()
+
+    async def stream():
+        async with broker.subscribe(session_id) as queue:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: document\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/documents/{document_id}", response_model=DocumentResponse)
 async def get_document(
+    request: Request,
+    response: Response,
     document_id: UUID,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific document."""
-    document = await DocumentService.get_document_for_user(db, document_id, current_user.id)
+    document = await DocumentService.get_document_for_user(db, document_id, user_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
+    # Every write to the row moves updated_at; sync_version covers the rest
+    not_modified = conditional_get(
+        request, response, "document", document.id, document.sync_version,
+        document.updated_at.isoformat(),
+    )
+    if not_modified:
+        return not_modified
     return DocumentResponse.model_validate(document)
 
 
 @router.get("/documents/{document_id}/status", response_model=DocumentStatusResponse)
 async def get_document_status(
     document_id: UUID,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Get the processing status of a document."""
     # Verify ownership
-    document = await DocumentService.get_document_for_user(db, document_id, current_user.id)
+    document = await DocumentService.get_document_for_user(db, document_id, user_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
-
-    status_response = await DocumentService.get_document_status(db, document_id)
-    if not status_response:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
-    return status_response
+    return DocumentService.document_status(document)
 
 
 @router.delete("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     document_id: UUID,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a document."""
-    document = await DocumentService.get_document_for_user(db, document_id, current_user.id)
+    document = await DocumentService.get_document_for_user(db, document_id, user_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -146,3 +271,13 @@ async def delete_document(
         )
     await DocumentService.delete_document(db, document)
     return None
+
+
+@router.post("/documents/bulk-delete", response_model=BulkResult)
+async def bulk_delete_documents(
+    bulk: BulkRequest,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete many documents at once; ids the user doesn't own are reported back."""
+    return await DocumentService.bulk_delete_documents(db, user_id, bulk.ids)
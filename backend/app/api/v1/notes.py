@@ -1,26 +1,57 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
-from app.db.models import User, StudySession
-from app.schemas import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from app.db.models import StudySession
+from app.schemas import (
+    BulkRequest,
+    BulkPinRequest,
+    BulkResult,
+    NoteCreate,
+    NoteUpdate,
+    NoteResponse,
+    NoteListResponse,
+)
 from app.services.note import NoteService
-from app.api.deps import get_current_user, get_session_for_user
+from app.api.deps import get_current_user_id, get_owned_session_id, get_session_for_user
+from app.core.etag import conditional_get
+from app.core.pagination import InvalidCursor
 
 router = APIRouter(tags=["Notes"])
 
 
 @router.get("/sessions/{session_id}/notes", response_model=NoteListResponse)
 async def list_notes(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool | None = Query(
+        None, description="Count all matching rows; by default only on offset pages"
+    ),
     session: StudySession = Depends(get_session_for_user),
     db: AsyncSession = Depends(get_db),
 ):
     """List all notes for a session."""
-    return await NoteService.list_notes(db, session.id, skip=skip, limit=limit)
+    not_modified = conditional_get(
+        request, response, "notes", session.id, session.notes_version
+    )
+    if not_modified:
+        return not_modified
+    try:
+        return await NoteService.list_notes(
+            db,
+            session.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post(
@@ -30,23 +61,23 @@ async def list_notes(
 )
 async def create_note(
     note_data: NoteCreate,
-    session: StudySession = Depends(get_session_for_user),
-    current_user: User = Depends(get_current_user),
+    session_id: UUID = Depends(get_owned_session_id),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new note in a session."""
-    note = await NoteService.create_note(db, session.id, current_user.id, note_data)
+    note = await NoteService.create_note(db, session_id, user_id, note_data)
     return NoteResponse.model_validate(note)
 
 
 @router.get("/notes/{note_id}", response_model=NoteResponse)
 async def get_note(
     note_id: UUID,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific note."""
-    note = await NoteService.get_note_for_user(db, note_id, current_user.id)
+    note = await NoteService.get_note_for_user(db, note_id, user_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,11 +90,11 @@ async def get_note(
 async def update_note(
     note_id: UUID,
     note_data: NoteUpdate,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a note."""
-    note = await NoteService.get_note_for_user(db, note_id, current_user.id)
+    note = await NoteService.get_note_for_user(db, note_id, user_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,11 +107,11 @@ async def update_note(
 @router.delete("/notes/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_note(
     note_id: UUID,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a note."""
-    note = await NoteService.get_note_for_user(db, note_id, current_user.id)
+    note = await NoteService.get_note_for_user(db, note_id, user_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -94,11 +125,11 @@ async def delete_note(
 async def pin_note(
     note_id: UUID,
     pin: bool = Query(True),
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Pin or unpin a note."""
-    note = await NoteService.get_note_for_user(db, note_id, current_user.id)
+    note = await NoteService.get_note_for_user(db, note_id, user_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,3 +137,23 @@ async def pin_note(
         )
     updated = await NoteService.pin_note(db, note, pin)
     return NoteResponse.model_validate(updated)
+
+
+@router.post("/notes/bulk-delete", response_model=BulkResult)
+async def bulk_delete_notes(
+    bulk: BulkRequest,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete many notes at once; ids the user doesn't own are reported back."""
+    return await NoteService.bulk_delete_notes(db, user_id, bulk.ids)
+
+
+@router.post("/notes/bulk-pin", response_model=BulkResult)
+async def bulk_pin_notes(
+    bulk: BulkPinRequest,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Pin or unpin many notes at once; ids the user doesn't own are reported back."""
+    return await NoteService.bulk_pin_notes(db, user_id, bulk.ids, bulk.pin)
@@ -1,55 +1,149 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
 from app.db.models import User, StudySession
 from app.schemas import (
+    BulkArchiveRequest,
+    BulkResult,
     SessionCreate,
     SessionUpdate,
     SessionResponse,
     SessionListResponse,
+    SessionDashboardResponse,
+    SessionChangesResponse,
 )
 from app.services.session import SessionService
-from app.api.deps import get_current_user, get_session_for_user
+from app.services.sync import SyncService
+from app.api.deps import get_current_user, get_current_user_id, get_owned_session_id, get_session_for_user
+from app.core.etag import conditional_get
+from app.core.pagination import InvalidCursor
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
 
 @router.get("", response_model=SessionListResponse)
 async def list_sessions(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     include_archived: bool = Query(False),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool | None = Query(
+        None, description="Count all matching rows; by default only on offset pages"
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """List all study sessions for the current user."""
-    return await SessionService.list_sessions(
-        db, current_user.id, skip=skip, limit=limit, include_archived=include_archived
+    not_modified = conditional_get(
+        request, response, "sessions", current_user.id, current_user.sessions_version
     )
+    if not_modified:
+        return not_modified
+    try:
+        return await SessionService.list_sessions(
+            db,
+            current_user.id,
+            skip=skip,
+            limit=limit,
+            include_archived=include_archived,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/dashboard", response_model=SessionDashboardResponse)
+async def list_dashboard(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    include_archived: bool = Query(False),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool | None = Query(
+        None, description="Count all matching rows; by default only on offset pages"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """List sessions with document, note and message counts for the dashboard."""
+    versions = await SessionService.dashboard_version(db, current_user.id)
+    not_modified = conditional_get(
+        request, response, "dashboard", current_user.id, current_user.sessions_version, *versions
+    )
+    if not_modified:
+        return not_modified
+    try:
+        return await SessionService.list_dashboard(
+            db,
+            current_user.id,
+            skip=skip,
+            limit=limit,
+            include_archived=include_archived,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_session(
     session_data: SessionCreate,
-    current_user: User = Depends(get_current_user),
+    user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new study session."""
-    session = await SessionService.create_session(db, current_user.id, session_data)
+    session = await SessionService.create_session(db, user_id, session_data)
     return SessionResponse.model_validate(session)
 
 
+@router.post("/bulk-archive", response_model=BulkResult)
+async def bulk_archive_sessions(
+    bulk: BulkArchiveRequest,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Archive or unarchive many sessions at once; ids the user doesn't own are reported back."""
+    return await SessionService.bulk_archive_sessions(
+        db, user_id, bulk.ids, bulk.archive
+    )
+
+
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(
+    request: Request,
+    response: Response,
     session: StudySession = Depends(get_session_for_user),
 ):
     """Get a specific study session."""
+    # Every change to a session (edit, archive) moves its updated_at
+    not_modified = conditional_get(request, response, "session", session.id, session.updated_at)
+    if not_modified:
+        return not_modified
     return SessionResponse.model_validate(session)
 
 
+@router.get("/{session_id}/changes", response_model=SessionChangesResponse)
+async def get_session_changes(
+    since: str | None = Query(None, description="cursor of the previous sync; omit for a full load"),
+    limit: int = Query(200, ge=1, le=500),
+    session_id: UUID = Depends(get_owned_session_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Messages and documents created or updated since the last sync."""
+    try:
+        return await SyncService.get_changes(db, session_id, since=since, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.put("/{session_id}", response_model=SessionResponse)
 async def update_session(
     session_data: SessionUpdate,
@@ -13,6 +13,23 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 60
+    # Decoded tokens, active users and session ownership are cached per
+    # worker for this long, so authenticated requests skip the lookups; a
+    # change made on another worker is seen within the TTL. 0 disables.
+    AUTH_CACHE_TTL_SECONDS: float = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # Put is_active in access tokens and trust it: no user lookup at all,
+    # but a deactivated user keeps access until the token expires
+    AUTH_ACTIVE_CLAIM: bool = False
+    # Argon2 cost of new password hashes; stored hashes made with other
+    # parameters are upgraded on the user's next login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Password hashing runs on this many threads, off the event loop. Once
+    # PASSWORD_HASH_MAX_PENDING more are queued, logins get a fast 503.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
     # Google AI
     GOOGLE_API_KEY: str = ""
@@ -20,18 +37,119 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
 
+    # How long completed responses are replayed for a repeated Idempotency-Key
+    IDEMPOTENCY_TTL_SECONDS: int = 600
+
     # File uploads
     UPLOAD_DIR: str = "uploads/documents"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    # Files in UPLOAD_DIR that no document references (left by a crash or a
+    # failed upload) are removed this often, once older than the grace
+    # period. 0 disables the sweep.
+    FILE_GC_INTERVAL_SECONDS: int = 3600
+    FILE_GC_GRACE_SECONDS: int = 3600
 
     # Embedding settings
     EMBEDDING_MODEL: str = "models/text-embedding-004"
     EMBEDDING_DIMENSION: int = 768
-    CHUNK_SIZE: int = 512
-    CHUNK_OVERLAP: int = 50
+    # Document chunk size and overlap between neighbouring chunks, in
+    # (estimated) tokens; about four characters each.
+    CHUNK_SIZE: int = 128
+    CHUNK_OVERLAP: int = 12
+    # Concurrent query embeddings are collected for up to this many
+    # milliseconds (or until the batch is full) and sent as one request.
+    # 0 disables batching.
+    EMBEDDING_BATCH_WINDOW_MS: float = 5
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
 
     # LLM settings
     LLM_MODEL: str = "gemini-2.0-flash"
+    # Model cascade: turns with a query, history and retrieved context within
+    # these limits are answered by LLM_FAST_MODEL; empty disables the cascade.
+    # Fast answers that look low-confidence are retried on LLM_MODEL when
+    # LLM_ESCALATE_LOW_CONFIDENCE is set.
+    LLM_FAST_MODEL: str = "gemini-2.0-flash-lite"
+    LLM_FAST_MAX_QUERY_CHARS: int = 200
+    LLM_FAST_MAX_HISTORY_MESSAGES: int = 6
+    LLM_FAST_MAX_CONTEXT_CHARS: int = 1500
+    LLM_ESCALATE_LOW_CONFIDENCE: bool = True
+
+    # Number of prior messages given to the LLM as conversation context
+    CHAT_HISTORY_WINDOW: int = 10
+
+    # Document event streams (SSE): a comment is sent this often to keep
+    # idle connections open through proxies, and each client buffers at most
+    # this many undelivered events before the oldest are dropped.
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    EVENT_QUEUE_SIZE: int = 100
+
+    # Time budget for one chat turn. LLM calls time out when it runs out:
+    # routing is skipped (retrieval assumed) and generation answers with a
+    # degraded reply. The router additionally gets at most
+    # ROUTER_TIMEOUT_SECONDS.
+    CHAT_TURN_BUDGET_SECONDS: float = 30
+    ROUTER_TIMEOUT_SECONDS: float = 5
+    # Hedging: when an LLM call outlasts the LLM_HEDGE_QUANTILE of its recent
+    # latencies, send a duplicate and take whichever answers first. Needs
+    # LLM_HEDGE_MIN_SAMPLES calls of history; costs extra provider quota.
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_QUANTILE: float = 0.95
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+
+    # Conversation state persistence (LangGraph Postgres checkpointer)
+    CHAT_CHECKPOINTS_ENABLED: bool = True
+    CHECKPOINT_KEEP_LAST: int = 2
+    CHECKPOINT_PRUNE_INTERVAL_SECONDS: int = 3600
+    PSYCOPG_POOL_SIZE: int = 5
+
+    # Per-session counters (session_stats) are kept in step by every write;
+    # this often, and once at startup, they are recounted and any drift
+    # fixed. 0 disables the repair job.
+    SESSION_STATS_REPAIR_INTERVAL_SECONDS: int = 3600
+
+    # Model provider backend: "google" (Gemini) or "fake", an offline
+    # stand-in with deterministic embeddings and a canned-text chat model
+    LLM_PROVIDER: str = "google"
+    # Fake provider: time to first token (with +/- jitter as a fraction), a
+    # share of calls that stall instead, streaming rate (0 = all at once),
+    # share of calls that fail, and latency per embedding request
+    FAKE_LLM_LATENCY_SECONDS: float = 0.2
+    FAKE_LLM_LATENCY_JITTER: float = 0.0
+    FAKE_LLM_STALL_RATE: float = 0.0
+    FAKE_LLM_STALL_SECONDS: float = 5.0
+    FAKE_LLM_TOKENS_PER_SECOND: float = 0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_EMBEDDING_LATENCY_SECONDS: float = 0.0
+
+    # Provider clients. PROVIDER_TRANSPORT is passed to the Google client
+    # ("grpc", "grpc_asyncio" or "rest"); None keeps the library default (gRPC).
+    PROVIDER_TRANSPORT: str | None = None
+    # Send one request through every provider client at startup so the first
+    # user request does not pay connection setup
+    PROVIDER_WARMUP_REQUEST: bool = False
+    # Provider scheduler. Requests are admitted interactive chat first, then
+    # query routing, then ingestion, within these concurrency caps (0 = no
+    # cap). Chat is uncapped by default so turns never queue behind a limit
+    # the provider doesn't have; routing and ingestion are capped so they
+    # can't crowd it out.
+    # PROVIDER_QUOTA_PER_MINUTE (0 = unlimited) is the shared quota, in
+    # units of one per generation request or embedded text; ingestion
+    # leaves PROVIDER_INGESTION_QUOTA_RESERVE of it for chat.
+    PROVIDER_MAX_CONCURRENCY: int = 0
+    PROVIDER_INTERACTIVE_CONCURRENCY: int = 0
+    PROVIDER_ROUTING_CONCURRENCY: int = 4
+    PROVIDER_INGESTION_CONCURRENCY: int = 2
+    PROVIDER_QUOTA_PER_MINUTE: int = 0
+    PROVIDER_INGESTION_QUOTA_RESERVE: float = 0.2
+    # Chunks per embedding request during ingestion; each batch is scheduled
+    # separately so chat can get in between batches of a large upload
+    INGESTION_EMBED_BATCH_SIZE: int = 100
+
+    # Build the conversation graph and its provider clients during startup
+    # instead of on the first chat request. Off by default so processes that
+    # never serve chat (workers, tests, scripts) don't import LangGraph and
+    # the Gemini clients; enable on chat-serving API instances.
+    WARM_UP_GRAPH: bool = False
 
     class Config:
         env_file = ".env"
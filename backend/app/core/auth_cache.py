@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Hashable
+from uuid import UUID
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class TTLCache:
+    """Bounded in-process map whose entries expire after a time to live.
+
+    When full, the oldest entries are dropped first. A TTL of 0 disables
+    the cache: nothing is stored.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        for key in [k for k, (_, v) in self._entries.items() if predicate(k, v)]:
+            del self._entries[key]
+
+
+class AuthCache:
+    """What recent requests established about who may do what.
+
+    Holds decoded access tokens, users known to be active and sessions
+    known to belong to a user, each for a short TTL, so an authenticated
+    request normally runs no authorization query. Only positive answers
+    are kept. State is per process: invalidation reaches the worker that
+    made the change, other workers catch up within the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        # token -> (user id, whether the token itself vouches for is_active)
+        self.tokens = TTLCache(ttl_seconds, max_entries)
+        # user id -> True
+        self.active_users = TTLCache(ttl_seconds, max_entries)
+        # (user id, session id) -> True
+        self.session_owners = TTLCache(ttl_seconds, max_entries)
+
+    def forget_user(self, user_id: UUID) -> None:
+        """Drop everything cached for a user (deactivation, logout, password reset)."""
+        self.active_users.discard(lambda key, _: key == user_id)
+        self.tokens.discard(lambda _, value: value[0] == user_id)
+        self.session_owners.discard(lambda key, _: key[0] == user_id)
+
+    def forget_session(self, session_id: UUID) -> None:
+        self.session_owners.discard(lambda key, _: key[1] == session_id)
+
+
+@lru_cache()
+def get_auth_cache() -> AuthCache:
+    return AuthCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
@@ -0,0 +1,45 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+# Clients may keep the response but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag for a representation identified by ``parts``.
+
+    ``parts`` should name the resource, its scope and the version counter
+    bumped by every write to it (see ``app.services.versions``).
+    """
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header lists ``etag`` (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(request: Request, response: Response, *parts: Any) -> Response | None:
+    """Answer a conditional GET from a version counter alone.
+
+    Returns a 304 response when the client's copy is current, so the caller
+    can skip loading the rows; otherwise sets the ETag on ``response`` and
+    returns None. The query string is part of the tag, so every page and
+    filter of a list is validated separately.
+    """
+    etag = make_etag(*parts, request.url.query)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
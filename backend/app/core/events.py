@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.core.metrics import EVENT_SUBSCRIBERS
+from app.db.database import engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel carrying document processing events
+DOCUMENT_EVENTS_CHANNEL = "document_events"
+# NOTIFY payloads are limited to 8000 bytes; long error messages are cut to fit
+_MAX_ERROR_CHARS = 2000
+
+
+async def publish_document_event(event: dict[str, Any]) -> None:
+    """NOTIFY a document event to every API worker.
+
+    Sent on its own short transaction, so progress inside a long ingestion
+    transaction is visible immediately. Status events should be published
+    after the change is committed, so listeners that re-read the document
+    see it. Failures are logged, never raised: events are best effort and
+    clients resync on reconnect.
+    """
+    if event.get("processing_error"):
+        event["processing_error"] = event["processing_error"][:_MAX_ERROR_CHARS]
+    try:
+        async with engine.connect() as conn:
+            payload = json.dumps(event, default=str)
+            await conn.execute(select(func.pg_notify(DOCUMENT_EVENTS_CHANNEL, payload)))
+            await conn.commit()
+    except Exception:
+        logger.warning("Could not publish document event", exc_info=True)
+
+
+class EventBroker:
+    """Fans NOTIFY events out to in-process subscribers, keyed by session.
+
+    Each worker holds one LISTEN connection, opened when the first client
+    subscribes and re-opened (with backoff) if it drops while anyone is
+    subscribed. Subscribers get a bounded queue; a client too slow to keep
+    up loses its oldest events rather than holding up the others.
+    """
+
+    def __init__(self, dsn: str, channel: str, queue_size: int = 100):
+        self.dsn = dsn
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._reconnect_task: asyncio.Task | None = None
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        for queue in self._subscribers.get(str(event.get("session_id")), ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def _on_terminate(self, connection) -> None:
+        if connection is not self._connection:
+            return
+        self._connection = None
+        if self._subscribers and (self._reconnect_task is None or self._reconnect_task.done()):
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        while self._subscribers and self._connection is None:
+            try:
+                await self._listen()
+            except Exception:
+                logger.warning("LISTEN connection failed; retrying in %.1fs", delay, exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        async with self._lock:
+            if self._connection is not None:
+                return
+            connection = await asyncpg.connect(self.dsn)
+            await connection.add_listener(self.channel, self._on_notify)
+            connection.add_termination_listener(self._on_terminate)
+            self._connection = connection
+
+    @asynccontextmanager
+    async def subscribe(self, session_id: Any) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the events of one session while the context is open."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        key = str(session_id)
+        await self._listen()
+        self._subscribers[key].add(queue)
+        EVENT_SUBSCRIBERS.inc()
+        try:
+            yield queue
+        finally:
+            EVENT_SUBSCRIBERS.dec()
+            self._subscribers[key].discard(queue)
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+
+    async def close(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+
+
+@lru_cache
+def get_event_broker() -> EventBroker:
+    # asyncpg takes a plain postgresql:// DSN, without SQLAlchemy's driver suffix
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return EventBroker(
+        dsn.render_as_string(hide_password=False),
+        DOCUMENT_EVENTS_CHANNEL,
+        queue_size=settings.EVENT_QUEUE_SIZE,
+    )
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class IdempotencyKeyConflict(Exception):
+    """Raised when an idempotency key is reused for a different request."""
+    pass
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    task: asyncio.Task
+    expires_at: float | None = None
+
+
+class IdempotencyStore:
+    """Single-flight execution and short-lived replay keyed by idempotency key.
+
+    The first request for a key starts the work as its own task. Duplicates
+    that arrive while it runs await that same task, and duplicates that
+    arrive after it finished get the stored result until the TTL expires.
+    Failed work is forgotten so the client can retry it. State is
+    per-process, so keys are deduplicated within one API worker.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, _Entry] = {}
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry.task is not task:
+            return
+        if task.cancelled() or task.exception() is not None:
+            del self._entries[key]
+        else:
+            entry.expires_at = time.monotonic() + self.ttl_seconds
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        work: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, bool]:
+        """Run ``work`` at most once per key.
+
+        Returns the result and whether it was shared with an earlier request.
+        The work is shielded, so a caller that goes away does not cancel it
+        for the others.
+        """
+        self._evict_expired()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyConflict(key)
+            return await asyncio.shield(entry.task), True
+
+        task = asyncio.create_task(work())
+        self._entries[key] = _Entry(fingerprint=fingerprint, task=task)
+        task.add_done_callback(lambda t: self._on_done(key, t))
+        return await asyncio.shield(task), False
+
+
+@lru_cache()
+def get_idempotency_store() -> IdempotencyStore:
+    return IdempotencyStore(ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS)
@@ -0,0 +1,150 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+
+# Chat turn steps: the graph nodes plus the lookups done before the graph runs
+CHAT_STEP_SECONDS = Histogram(
+    "studybuddy_chat_step_duration_seconds",
+    "Time spent in each step of a chat turn",
+    ["step"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+CHAT_TURN_SECONDS = Histogram(
+    "studybuddy_chat_turn_duration_seconds",
+    "End-to-end time of a chat turn through the conversation graph",
+    buckets=(0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60),
+)
+
+LLM_TOKENS = Histogram(
+    "studybuddy_llm_tokens",
+    "Tokens per LLM call",
+    ["step", "kind"],
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+
+# Generation model cascade, per tier (fast, standard)
+GENERATION_TIER_SECONDS = Histogram(
+    "studybuddy_generation_tier_duration_seconds",
+    "Time of generation LLM calls per model tier",
+    ["tier"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34),
+)
+
+GENERATION_TIER_TOKENS = Histogram(
+    "studybuddy_generation_tier_tokens",
+    "Tokens per generation LLM call per model tier",
+    ["tier", "kind"],
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+
+GENERATION_ESCALATIONS = Counter(
+    "studybuddy_generation_escalations_total",
+    "Fast-tier answers retried on the standard model after looking low-confidence",
+)
+
+LLM_HEDGES = Counter(
+    "studybuddy_llm_hedged_requests_total",
+    "LLM calls that sent a hedge request, by which attempt answered first",
+    ["step", "winner"],
+)
+
+DEADLINE_FALLBACKS = Counter(
+    "studybuddy_chat_deadline_fallbacks_total",
+    "Graph steps that fell back to a degraded result when the turn budget ran out",
+    ["step"],
+)
+
+RETRIEVED_CHUNKS = Histogram(
+    "studybuddy_retrieval_chunks",
+    "Chunks returned by a retrieval above the score threshold",
+    buckets=(0, 1, 2, 3, 4, 5, 10),
+)
+
+RETRIEVAL_SIMILARITY = Histogram(
+    "studybuddy_retrieval_similarity",
+    "Similarity scores of retrieved chunks",
+    buckets=(0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0),
+)
+
+INGESTION_STAGE_SECONDS = Histogram(
+    "studybuddy_ingestion_stage_duration_seconds",
+    "Time spent in each document ingestion stage (extract, split, embed, store)",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "studybuddy_query_embedding_batch_size",
+    "Distinct query texts per batched embedding request",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+# Provider scheduler: per priority class (interactive, routing, ingestion)
+PROVIDER_QUEUE_DEPTH = Gauge(
+    "studybuddy_provider_queue_depth",
+    "Provider requests waiting for an admission slot",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+PROVIDER_QUEUE_WAIT_SECONDS = Histogram(
+    "studybuddy_provider_queue_wait_seconds",
+    "Time a provider request waited for an admission slot",
+    ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+PROVIDER_QUOTA_USED = Counter(
+    "studybuddy_provider_quota_used_total",
+    "Provider quota units spent (one per request or embedded text)",
+    ["priority"],
+)
+
+HISTORY_SOURCE = Counter(
+    "studybuddy_chat_history_source_total",
+    "Where a chat turn got its conversation history: stored checkpoint (hit) or database (miss)",
+    ["source"],
+)
+
+# Argon2 password hashing pool
+PASSWORD_HASH_PENDING = Gauge(
+    "studybuddy_password_hash_pending",
+    "Password hash and verify jobs running or queued",
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    "studybuddy_password_hash_rejected_total",
+    "Password hash and verify jobs turned away because the pool was full",
+)
+
+# Clients connected to the document event stream (SSE)
+EVENT_SUBSCRIBERS = Gauge(
+    "studybuddy_event_subscribers",
+    "Open document event streams",
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (several API worker processes), the
+    per-process metric files are aggregated.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
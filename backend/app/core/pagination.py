@@ -0,0 +1,119 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Row, Select, and_, func, literal, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that was not issued by us or no longer fits."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the sort key of the last row on a page."""
+    plain = [
+        v.isoformat() if isinstance(v, datetime) else str(v) if isinstance(v, UUID) else v
+        for v in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(plain).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Sort key values from a cursor, typed to match ``columns``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        plain = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(plain, list) or len(plain) != len(columns):
+            raise InvalidCursor("Invalid cursor")
+        values = []
+        for column, value in zip(columns, plain):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is UUID:
+                value = UUID(value)
+            elif not isinstance(value, python_type):
+                raise InvalidCursor("Invalid cursor")
+            values.append(value)
+        return values
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def _after(
+    columns: Sequence[InstrumentedAttribute], values: Sequence[Any], directions: Sequence[bool]
+) -> ColumnElement[bool]:
+    """Rows that sort after the key ``values`` (True in ``directions`` = descending)."""
+    bounds = [literal(v, c.type) for c, v in zip(columns, values)]
+    if len(set(directions)) == 1:
+        # One row-value comparison, which the composite index serves as a seek
+        key, bound = tuple_(*columns), tuple_(*bounds)
+        return key < bound if directions[0] else key > bound
+    # Mixed directions: equal up to some column and past the bound on it
+    return or_(
+        *(
+            and_(
+                *(c == b for c, b in zip(columns[:i], bounds[:i])),
+                column < bound if descending else column > bound,
+            )
+            for i, (column, bound, descending) in enumerate(zip(columns, bounds, directions))
+        )
+    )
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: Sequence[InstrumentedAttribute],
+    *,
+    descending: bool | Sequence[bool],
+    limit: int,
+    skip: int = 0,
+    cursor: str | None = None,
+    include_total: bool = False,
+    count_query: Select | None = None,
+    total: int | None = None,
+) -> tuple[list, str | None, int | None]:
+    """Run one page of ``query`` ordered by the ``order_by`` key.
+
+    With a ``cursor`` the page starts right after the row it was issued for
+    (a keyset seek on the composite index over ``order_by``, so every page
+    costs the same), otherwise ``skip`` rows in. ``descending`` applies to
+    every column, or is given per column. Returns the rows, the cursor
+    for the next page (None on the last page) and, if ``include_total``, the
+    number of rows matching ``query``.
+
+    Rows are entities, or Row tuples when ``query`` selects more columns
+    after the entity; the sort key is read from the entity either way. Pass
+    ``count_query`` to count without joins that only add columns, or a
+    ``total`` already known (a maintained counter) to skip the count.
+    """
+    if not include_total:
+        total = None
+    elif total is None:
+        count_query = (count_query if count_query is not None else query).with_only_columns(
+            func.count(), maintain_column_froms=True
+        ).order_by(None)
+        total = (await db.execute(count_query)).scalar() or 0
+
+    if isinstance(descending, bool):
+        descending = [descending] * len(order_by)
+    if cursor:
+        query = query.where(_after(order_by, decode_cursor(cursor, order_by), descending))
+    elif skip:
+        query = query.offset(skip)
+
+    query = query.order_by(*(c.desc() if d else c.asc() for c, d in zip(order_by, descending)))
+    # One extra row tells whether there is a next page
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.all() if len(query.column_descriptions) > 1 else result.scalars().all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0] if isinstance(rows[-1], Row) else rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in order_by])
+    return rows, next_cursor, total
@@ -1,15 +1,30 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
 from jose import jwt, JWTError
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 
 from app.config import get_settings
+from app.core.metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTED
 
 settings = get_settings()
 
+T = TypeVar("T")
+
 # Password hashing with Argon2
-password_hasher = PasswordHash((Argon2Hasher(),))
+password_hasher = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+            parallelism=settings.ARGON2_PARALLELISM,
+        ),
+    )
+)
 
 
 class InvalidTokenError(Exception):
@@ -17,14 +32,69 @@ class InvalidTokenError(Exception):
     pass
 
 
-def hash_password(password: str) -> str:
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already running or queued."""
+    pass
+
+
+class PasswordHashPool:
+    """Bounded thread pool for Argon2 work.
+
+    Argon2 deliberately burns tens of milliseconds of CPU and megabytes of
+    memory per call; run on the event loop, a burst of logins would stall
+    every other request on the worker. argon2-cffi releases the GIL, so a
+    few threads hash in parallel with the loop. Jobs beyond the workers
+    queue up to ``max_pending``; past that, callers get PasswordHasherBusy
+    at once instead of waiting behind the backlog.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._capacity = workers + max_pending
+        self._in_flight = 0
+        # Released from the worker threads when a job finishes
+        self._lock = threading.Lock()
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        PASSWORD_HASH_PENDING.dec()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                PASSWORD_HASH_REJECTED.inc()
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+        PASSWORD_HASH_PENDING.inc()
+        # Counted until the job itself ends, even if the request is cancelled
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+
+@lru_cache
+def get_password_hash_pool() -> PasswordHashPool:
+    return PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password(password: str) -> str:
     """Hash a password using Argon2."""
-    return password_hasher.hash(password)
+    return await get_password_hash_pool().run(password_hasher.hash, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return password_hasher.verify(plain_password, hashed_password)
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password and, if its hash uses outdated Argon2 parameters, rehash it.
+
+    Returns whether the password matches and the new hash to store, if any.
+    """
+    return await get_password_hash_pool().run(
+        password_hasher.verify_and_update, plain_password, hashed_password
+    )
 
 
 def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -39,6 +109,9 @@ def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None)
         "exp": expire,
         "type": "access"
     }
+    if settings.AUTH_ACTIVE_CLAIM:
+        # Access tokens are only issued to active users
+        payload["active"] = True
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -66,15 +139,19 @@ def decode_token(token: str) -> dict:
         raise InvalidTokenError(str(e))
 
 
-def verify_access_token(token: str) -> str:
-    """Verify an access token and return the user ID."""
+def decode_access_token(token: str) -> dict:
+    """Verify an access token and return its claims."""
     payload = decode_token(token)
     if payload.get("type") != "access":
         raise InvalidTokenError("Invalid token type")
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise InvalidTokenError("Invalid token payload")
-    return user_id
+    return payload
+
+
+def verify_access_token(token: str) -> str:
+    """Verify an access token and return the user ID."""
+    return decode_access_token(token)["sub"]
 
 
 def verify_refresh_token(token: str) -> str:
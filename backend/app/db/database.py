@@ -21,6 +21,37 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+# psycopg pool for components that need a native psycopg connection rather than
+# SQLAlchemy (the LangGraph checkpointer). Opened and closed by the app lifespan.
+psycopg_pool = None
+
+
+async def open_psycopg_pool():
+    """Open the shared psycopg connection pool."""
+    global psycopg_pool
+    if psycopg_pool is None:
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool
+
+        psycopg_pool = AsyncConnectionPool(
+            settings.DATABASE_URL_SYNC,
+            min_size=1,
+            max_size=settings.PSYCOPG_POOL_SIZE,
+            kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+            open=False,
+        )
+        await psycopg_pool.open()
+    return psycopg_pool
+
+
+async def close_psycopg_pool():
+    """Close the shared psycopg connection pool."""
+    global psycopg_pool
+    if psycopg_pool is not None:
+        await psycopg_pool.close()
+        psycopg_pool = None
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -34,6 +65,27 @@ async def get_db():
             await session.close()
 
 
+# Idempotent DDL for columns and indexes added to existing tables after their first release
+SCHEMA_UPGRADES = [
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS processing_metrics JSONB",
+    "CREATE INDEX IF NOT EXISTS ix_chat_messages_session_created_id ON chat_messages (session_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_documents_session_created_id ON documents (session_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_notes_session_pinned_created_id ON notes (session_id, is_pinned, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_study_sessions_user_created_id ON study_sessions (user_id, created_at, id)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS sessions_version BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE study_sessions ADD COLUMN IF NOT EXISTS documents_version BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE study_sessions ADD COLUMN IF NOT EXISTS notes_version BIGINT NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_documents_filename ON documents (filename)",
+    "ALTER TABLE study_sessions ADD COLUMN IF NOT EXISTS sync_version BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE study_sessions ADD COLUMN IF NOT EXISTS sync_reset_version BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS sync_version BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS sync_version BIGINT NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_chat_messages_session_sync_id ON chat_messages (session_id, sync_version, id)",
+    "CREATE INDEX IF NOT EXISTS ix_documents_session_sync ON documents (session_id, sync_version)",
+    "ALTER TABLE session_stats ADD COLUMN IF NOT EXISTS failed_document_count INTEGER NOT NULL DEFAULT 0",
+]
+
+
 async def init_db():
     """Initialize database tables and extensions."""
     async with engine.begin() as conn:
@@ -41,3 +93,6 @@ async def init_db():
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        # create_all only creates missing tables; add columns and indexes introduced since
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
@@ -1,5 +1,6 @@
 from app.db.models.user import User, RefreshToken, PasswordResetToken
 from app.db.models.session import StudySession
+from app.db.models.session_stats import SessionStatistics
 from app.db.models.document import Document, DocumentChunk
 from app.db.models.message import ChatMessage
 from app.db.models.note import Note
@@ -9,6 +10,7 @@ __all__ = [
     "RefreshToken",
     "PasswordResetToken",
     "StudySession",
+    "SessionStatistics",
     "Document",
     "DocumentChunk",
     "ChatMessage",
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, DateTime, Text, ForeignKey
+from sqlalchemy import BigInteger, Index, String, Integer, DateTime, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from pgvector.sqlalchemy import Vector
@@ -13,6 +13,12 @@ settings = get_settings()
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination of a session's documents
+        Index("ix_documents_session_created_id", "session_id", "created_at", "id"),
+        # Delta sync
+        Index("ix_documents_session_sync", "session_id", "sync_version"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -23,7 +29,8 @@ class Document(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Indexed for the upload garbage collector's lookups
+    filename: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -33,6 +40,12 @@ class Document(Base):
     )  # pending, processing, completed, failed
     processing_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     chunk_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Ingestion stage timings: extract/split/embed/store/total ms, characters, chunks
+    processing_metrics: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # The session's sync_version of the last change to this document
+    sync_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -44,7 +57,9 @@ class Document(Base):
 
     # Relationships
     session = relationship("StudySession", back_populates="documents")
-    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
+    chunks = relationship(
+        "DocumentChunk", back_populates="document", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class DocumentChunk(Base):
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Index, String, Boolean, DateTime, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -9,6 +9,10 @@ from app.db.database import Base
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Keyset pagination of a session's notes
+        Index("ix_notes_session_pinned_created_id", "session_id", "is_pinned", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
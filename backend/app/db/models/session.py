@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import BigInteger, Index, String, Boolean, DateTime, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -9,6 +9,10 @@ from app.db.database import Base
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
+    __table_args__ = (
+        # Keyset pagination of a user's sessions
+        Index("ix_study_sessions_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -20,6 +24,22 @@ class StudySession(Base):
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     subject: Mapped[str | None] = mapped_column(String(100), nullable=True)
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Bumped on every write to the session's documents / notes; part of their ETags
+    documents_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    notes_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    # Delta sync (app.services.sync): every change to the session's messages
+    # and documents takes the next sync_version; sync_reset_version is the
+    # last one that deleted any, which a delta cannot express
+    sync_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    sync_reset_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
     )
@@ -29,8 +49,9 @@ class StudySession(Base):
         onupdate=lambda: datetime.now(timezone.utc)
     )
 
-    # Relationships
+    # Relationships. Children are removed by the database (ON DELETE CASCADE),
+    # never loaded just to be deleted
     user = relationship("User", back_populates="sessions")
-    documents = relationship("Document", back_populates="session", cascade="all, delete-orphan")
-    messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
-    notes = relationship("Note", back_populates="session", cascade="all, delete-orphan")
+    documents = relationship("Document", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+    messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
+    notes = relationship("Note", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
@@ -0,0 +1,36 @@
+import uuid
+from sqlalchemy import BigInteger, Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.database import Base
+
+
+class SessionStatistics(Base):
+    """Running totals of a session's content, kept by the service layer.
+
+    Every write that adds or removes documents, chunks, messages or notes
+    adjusts the session's row in the same transaction (see
+    ``app.services.stats``), so reads are a primary-key lookup instead of a
+    COUNT over the child table.
+    """
+
+    __tablename__ = "session_stats"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("study_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    document_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed_document_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    failed_document_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    note_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped with every adjustment; changes whenever any of the counts' content does
+    content_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
@@ -0,0 +1,56 @@
+import re
+from dataclasses import dataclass
+
+from app.graph.state import GraphState
+from app.config import get_settings
+
+settings = get_settings()
+
+FAST = "fast"
+STANDARD = "standard"
+
+# Phrases that suggest the fast model could not answer properly
+_LOW_CONFIDENCE = re.compile(
+    r"\b(i'?m not (sure|certain)|i don'?t know|i (can ?not|can'?t|am unable to) "
+    r"(answer|help|find|determine)|not enough (information|context)|"
+    r"(do|does)(n'?t| not) (contain|mention|say|cover)|unclear)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class TierChoice:
+    """Model tier picked for a turn's generation and why."""
+
+    tier: str
+    model: str
+    reason: str
+
+
+def tier_model(tier: str) -> str:
+    return settings.LLM_FAST_MODEL if tier == FAST else settings.LLM_MODEL
+
+
+def choose_tier(state: GraphState, context_chars: int) -> TierChoice:
+    """Pick the generation tier from the turn's routing, context and size.
+
+    Short queries in short conversations with little or no retrieved context
+    (smalltalk, quick factual lookups) go to the fast tier; anything larger
+    goes to the standard model.
+    """
+    if not settings.LLM_FAST_MODEL:
+        return TierChoice(STANDARD, settings.LLM_MODEL, "cascade disabled")
+    if len(state["user_query"]) > settings.LLM_FAST_MAX_QUERY_CHARS:
+        return TierChoice(STANDARD, settings.LLM_MODEL, "long query")
+    if len(state.get("messages", [])) > settings.LLM_FAST_MAX_HISTORY_MESSAGES:
+        return TierChoice(STANDARD, settings.LLM_MODEL, "long history")
+    if context_chars > settings.LLM_FAST_MAX_CONTEXT_CHARS:
+        return TierChoice(STANDARD, settings.LLM_MODEL, "large context")
+
+    reason = "short lookup" if state.get("needs_retrieval") else "smalltalk"
+    return TierChoice(FAST, settings.LLM_FAST_MODEL, reason)
+
+
+def looks_low_confidence(content: str) -> bool:
+    """Whether a fast-tier answer should be retried on the standard model."""
+    return not content.strip() or bool(_LOW_CONFIDENCE.search(content))
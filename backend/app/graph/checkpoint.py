@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Process-wide checkpointer, set up by the app lifespan when
+# CHAT_CHECKPOINTS_ENABLED is on. None means every turn rebuilds its state
+# from the chat_messages table.
+_checkpointer = None
+
+
+def get_checkpointer():
+    """Return the configured checkpointer, if any."""
+    return _checkpointer
+
+
+async def setup_checkpointer(pool):
+    """Create the Postgres checkpointer on the shared pool and run its migrations."""
+    global _checkpointer
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+    checkpointer = AsyncPostgresSaver(pool)
+    await checkpointer.setup()
+    _checkpointer = checkpointer
+    return checkpointer
+
+
+def reset_checkpointer() -> None:
+    global _checkpointer
+    _checkpointer = None
+
+
+async def delete_thread(session_id: UUID) -> None:
+    """Drop the stored conversation state for a session."""
+    if _checkpointer is None:
+        return
+    async with _checkpointer.conn.connection() as conn:
+        for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints"):
+            await conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = %s", (str(session_id),)
+            )
+
+
+async def prune_checkpoints(keep_last: int) -> int:
+    """Delete all but the newest ``keep_last`` checkpoints of every thread.
+
+    Threads whose study session no longer exists are dropped entirely. Writes
+    and channel blobs no longer referenced by a remaining checkpoint are
+    removed too. Returns the number of checkpoints deleted.
+    """
+    if _checkpointer is None:
+        return 0
+    async with _checkpointer.conn.connection() as conn:
+        async with conn.transaction():
+            result = await conn.execute(
+                """
+                DELETE FROM checkpoints c
+                USING (
+                    SELECT thread_id, checkpoint_ns, checkpoint_id,
+                           row_number() OVER (
+                               PARTITION BY thread_id, checkpoint_ns
+                               ORDER BY checkpoint_id DESC
+                           ) AS rn
+                    FROM checkpoints
+                ) ranked
+                WHERE c.thread_id = ranked.thread_id
+                    AND c.checkpoint_ns = ranked.checkpoint_ns
+                    AND c.checkpoint_id = ranked.checkpoint_id
+                    AND (
+                        ranked.rn > %(keep_last)s
+                        OR NOT EXISTS (
+                            SELECT 1 FROM study_sessions s
+                            WHERE s.id::text = c.thread_id
+                        )
+                    )
+                """,
+                {"keep_last": keep_last},
+            )
+            deleted = result.rowcount
+            await conn.execute(
+                """
+                DELETE FROM checkpoint_writes w
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = w.thread_id
+                        AND c.checkpoint_ns = w.checkpoint_ns
+                        AND c.checkpoint_id = w.checkpoint_id
+                )
+                """
+            )
+            await conn.execute(
+                """
+                DELETE FROM checkpoint_blobs b
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = b.thread_id
+                        AND c.checkpoint_ns = b.checkpoint_ns
+                        AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+                )
+                """
+            )
+    return deleted
+
+
+async def run_checkpoint_pruner(interval_seconds: float, keep_last: int) -> None:
+    """Prune checkpoints forever at a fixed interval; cancel the task to stop."""
+    while True:
+        try:
+            deleted = await prune_checkpoints(keep_last)
+            if deleted:
+                logger.info("Pruned %d old checkpoints", deleted)
+        except Exception:
+            logger.exception("Checkpoint pruning failed")
+        await asyncio.sleep(interval_seconds)
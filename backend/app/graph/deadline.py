@@ -0,0 +1,78 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.metrics import LLM_HEDGES
+from app.providers import INTERACTIVE, get_provider_registry
+from app.providers.hedging import get_latency_tracker, hedged
+from app.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Point in time (``time.perf_counter``) by which a chat turn must answer."""
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float, start: float | None = None) -> "Deadline":
+        return cls((time.perf_counter() if start is None else start) + seconds)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.perf_counter()
+
+    def timeout(self, cap: float | None = None) -> float:
+        """Time left for one call: the remaining budget, at most ``cap``."""
+        remaining = self.remaining()
+        return remaining if cap is None else min(remaining, cap)
+
+
+def turn_deadline(config: dict) -> Deadline:
+    """The turn's deadline from the graph config, or a fresh full budget."""
+    deadline = config.get("configurable", {}).get("deadline")
+    return deadline or Deadline.after(settings.CHAT_TURN_BUDGET_SECONDS)
+
+
+async def invoke_llm(
+    step: str,
+    llm,
+    chain,
+    inputs: dict,
+    deadline: Deadline,
+    priority: str = INTERACTIVE,
+    cap: float | None = None,
+    tier: str | None = None,
+) -> tuple[Any, dict]:
+    """Invoke an LLM chain within the turn's deadline, hedging when enabled.
+
+    The hedge delay is the LLM_HEDGE_QUANTILE of this step's recent
+    latencies (per model tier, if given), so only calls in the slow tail
+    are duplicated. Returns the reply and metrics for the node; raises
+    TimeoutError when the budget runs out.
+    """
+    registry = get_provider_registry()
+    tracker = get_latency_tracker()
+    latency_key = step if tier is None else f"{step}:{tier}"
+
+    async def attempt():
+        start = time.perf_counter()
+        async with registry.track(llm, priority=priority):
+            result = await chain.ainvoke(inputs)
+        tracker.record(latency_key, time.perf_counter() - start)
+        return result
+
+    timeout = deadline.timeout(cap)
+    hedge_after = None
+    if settings.LLM_HEDGING_ENABLED:
+        hedge_after = tracker.quantile(
+            latency_key, settings.LLM_HEDGE_QUANTILE, min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+        )
+
+    result, winner = await hedged(attempt, timeout=timeout, hedge_after=hedge_after)
+    metrics = {"timeout_ms": round(timeout * 1000, 1)}
+    if winner is not None:
+        LLM_HEDGES.labels(step=step, winner=winner).inc()
+        metrics["hedge_winner"] = winner
+    return result, metrics
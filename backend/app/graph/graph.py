@@ -1,34 +1,63 @@
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, RemoveMessage
 from langgraph.graph import StateGraph, END
 
 from app.graph.state import GraphState
+from app.graph.cascade import FAST
+from app.graph.checkpoint import get_checkpointer
+from app.graph.deadline import Deadline
+from app.graph.instrumentation import InstrumentedNode
 from app.graph.nodes.router import QueryRouterNode
 from app.graph.nodes.retrieval import RetrievalNode
 from app.graph.nodes.generation import GenerationNode
 from app.services.embedding import EmbeddingService
+from app.core.metrics import CHAT_STEP_SECONDS, CHAT_TURN_SECONDS, HISTORY_SOURCE
+from app.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass
+class PreparedTurn:
+    """Graph input and config for one chat turn, built from the read phase."""
+
+    config: dict
+    turn_input: GraphState
+    query_message_id: str
+    started_at: float
 
 
 class StudyBuddyGraph:
-    """LangGraph-based conversation flow for the study buddy."""
+    """LangGraph-based conversation flow for the study buddy.
 
-    def __init__(self):
+    With a checkpointer, each study session is one LangGraph thread: its
+    message history lives in the stored thread state and a turn only appends
+    the new message. Without one, history is rebuilt from the database.
+    """
+
+    def __init__(self, checkpointer=None):
         self.router = QueryRouterNode()
         self.embedding_service = EmbeddingService()
         self.retrieval = RetrievalNode(self.embedding_service)
         self.generation = GenerationNode()
+        self.checkpointer = checkpointer
         self._graph = self._build_graph()
 
     def _build_graph(self):
         """Build and compile the conversation graph."""
         workflow = StateGraph(GraphState)
 
-        # Add nodes with real callables
-        workflow.add_node("route_query", self.router)
-        workflow.add_node("retrieve", self.retrieval)
-        workflow.add_node("generate", self.generation)
+        # Add nodes with real callables, each timed and token-accounted
+        workflow.add_node("route_query", InstrumentedNode("route_query", self.router))
+        workflow.add_node("retrieve", InstrumentedNode("retrieve", self.retrieval))
+        workflow.add_node("generate", InstrumentedNode("generate", self.generation))
 
         # Define edges
         workflow.set_entry_point("route_query")
@@ -45,33 +74,86 @@ class StudyBuddyGraph:
         workflow.add_edge("retrieve", "generate")
         workflow.add_edge("generate", END)
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    def warm_up(self) -> None:
+        """Construct the provider clients ahead of the first chat turn."""
+        _ = self.router.llm
+        _ = self.generation.llm
+        if settings.LLM_FAST_MODEL:
+            _ = self.generation.llm_for(FAST)
+        _ = self.embedding_service.embeddings
 
-    async def run(
+    async def _thread_messages(
         self,
-        db: AsyncSession,
-        session_id: UUID,
-        user_id: UUID,
-        user_query: str,
-        conversation_history: list[dict],
-    ) -> dict:
-        """Run the conversation graph."""
+        config: dict,
+        load_history: Callable[[], Awaitable[list[dict]]],
+    ) -> tuple[list, str]:
+        """Messages to add to the thread ahead of the new query, and their source.
+
+        A stored thread is trimmed to the last CHAT_HISTORY_WINDOW messages.
+        A new thread, or one without checkpointing, is seeded from the database.
+        """
+        if self.checkpointer is not None:
+            snapshot = await self._graph.aget_state(config)
+            stored = snapshot.values.get("messages", [])
+            if stored:
+                excess = len(stored) - settings.CHAT_HISTORY_WINDOW
+                return [RemoveMessage(id=m.id) for m in stored[:max(excess, 0)]], "checkpoint"
+
         # Convert conversation history to LangChain messages
         messages = []
-        for msg in conversation_history:
+        for msg in await load_history():
             if msg["role"] == "user":
                 messages.append(HumanMessage(content=msg["content"]))
             else:
                 messages.append(AIMessage(content=msg["content"]))
-
-        # Add current query
-        messages.append(HumanMessage(content=user_query))
+        return messages, "database"
+
+    async def _discard_message(self, config: dict, message_id: str) -> None:
+        """Keep a failed turn's query out of the stored thread history."""
+        snapshot = await self._graph.aget_state(config)
+        if any(m.id == message_id for m in snapshot.values.get("messages", [])):
+            await self._graph.aupdate_state(
+                config,
+                {"messages": [RemoveMessage(id=message_id)]},
+                as_node="generate",
+            )
+
+    async def prepare_turn(
+        self,
+        db: AsyncSession,
+        session_id: UUID,
+        user_id: UUID,
+        user_query: str,
+        load_history: Callable[[], Awaitable[list[dict]]],
+    ) -> PreparedTurn:
+        """Do the database reads a turn needs before any LLM call.
+
+        ``load_history`` returns the recent conversation as role/content dicts
+        and is only awaited when there is no stored thread state to resume.
+        The caller can end its transaction as soon as this returns.
+        """
+        # Keyed by session so each study session resumes its own thread
+        config = {"configurable": {"thread_id": str(session_id)}}
+
+        turn_start = time.perf_counter()
+        query_message = HumanMessage(content=user_query, id=str(uuid.uuid4()))
+        messages, history_source = await self._thread_messages(config, load_history)
+        messages.append(query_message)
+        history_seconds = time.perf_counter() - turn_start
+        HISTORY_SOURCE.labels(source=history_source).inc()
+        CHAT_STEP_SECONDS.labels(step="history").observe(history_seconds)
 
         # Check if session has documents
+        step_start = time.perf_counter()
         has_documents = await self.embedding_service.has_documents(db, session_id)
+        has_documents_seconds = time.perf_counter() - step_start
+        CHAT_STEP_SECONDS.labels(step="has_documents").observe(has_documents_seconds)
 
-        # Initialize state
-        initial_state: GraphState = {
+        # Per-turn fields are reset explicitly since a stored thread carries
+        # the previous turn's values
+        turn_input: GraphState = {
             "user_query": user_query,
             "session_id": str(session_id),
             "user_id": str(user_id),
@@ -82,19 +164,63 @@ class StudyBuddyGraph:
             "has_documents": has_documents,
             "response": None,
             "sources": [],
+            "turn_metrics": {
+                "history": {
+                    "source": history_source,
+                    "duration_ms": round(history_seconds * 1000, 1),
+                },
+                "has_documents": {"duration_ms": round(has_documents_seconds * 1000, 1)},
+            },
         }
-
-        # Run the compiled graph, passing db via config
-        result = await self._graph.ainvoke(
-            initial_state,
-            config={"configurable": {"db": db}},
+        return PreparedTurn(
+            config=config,
+            turn_input=turn_input,
+            query_message_id=query_message.id,
+            started_at=turn_start,
         )
 
+    async def execute_turn(
+        self,
+        turn: PreparedTurn,
+        session_factory: Callable[[], AsyncSession],
+    ) -> dict:
+        """Run the conversation graph for a prepared turn.
+
+        Nodes that need the database open their own short-lived session from
+        ``session_factory``, so no pooled connection is held across LLM calls.
+        LLM calls share the turn's CHAT_TURN_BUDGET_SECONDS deadline, counted
+        from the start of ``prepare_turn``.
+        """
+        config = {
+            "configurable": {
+                **turn.config["configurable"],
+                "session_factory": session_factory,
+                "deadline": Deadline.after(
+                    settings.CHAT_TURN_BUDGET_SECONDS, start=turn.started_at
+                ),
+            }
+        }
+        try:
+            result = await self._graph.ainvoke(turn.turn_input, config=config)
+        except Exception:
+            if self.checkpointer is not None:
+                await self._discard_message(config, turn.query_message_id)
+            raise
+
+        turn_seconds = time.perf_counter() - turn.started_at
+        CHAT_TURN_SECONDS.observe(turn_seconds)
+
         return {
             "response": result["response"],
             "sources": result["sources"],
+            "metrics": {
+                "total_ms": round(turn_seconds * 1000, 1),
+                "steps": result["turn_metrics"],
+            },
         }
 
 
-# Singleton instance
-study_buddy_graph = StudyBuddyGraph()
+@lru_cache()
+def get_study_buddy_graph() -> StudyBuddyGraph:
+    """Return the process-wide graph, building it on first use."""
+    return StudyBuddyGraph(checkpointer=get_checkpointer())
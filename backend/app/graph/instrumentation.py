@@ -0,0 +1,49 @@
+import inspect
+import time
+
+from langchain_core.runnables import RunnableConfig
+
+from app.core.metrics import CHAT_STEP_SECONDS, LLM_TOKENS
+from app.graph.state import GraphState
+
+
+def usage_metrics(message) -> dict:
+    """Prompt/completion token counts reported by the provider for a reply."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return {
+        "prompt_tokens": usage.get("input_tokens", 0),
+        "completion_tokens": usage.get("output_tokens", 0),
+    }
+
+
+class InstrumentedNode:
+    """Wraps a graph node with timing and token accounting.
+
+    Nodes may return a ``node_metrics`` dict alongside their state update.
+    It is merged with the node's duration into the turn's ``turn_metrics``
+    breakdown, and token counts are exported as Prometheus histograms.
+    """
+
+    def __init__(self, name: str, node):
+        self.name = name
+        self.node = node
+        self._takes_config = "config" in inspect.signature(node.__call__).parameters
+
+    async def __call__(self, state: GraphState, config: RunnableConfig) -> GraphState:
+        start = time.perf_counter()
+        if self._takes_config:
+            update = await self.node(state, config)
+        else:
+            update = await self.node(state)
+        elapsed = time.perf_counter() - start
+
+        update = dict(update)
+        node_metrics = {"duration_ms": round(elapsed * 1000, 1), **update.pop("node_metrics", {})}
+
+        CHAT_STEP_SECONDS.labels(step=self.name).observe(elapsed)
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if node_metrics.get(kind):
+                LLM_TOKENS.labels(step=self.name, kind=kind).observe(node_metrics[kind])
+
+        update["turn_metrics"] = {**state.get("turn_metrics", {}), self.name: node_metrics}
+        return update
@@ -1,22 +1,33 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import time
+
+from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableConfig
 
 from app.graph.state import GraphState
+from app.graph.cascade import FAST, STANDARD, choose_tier, looks_low_confidence, tier_model
+from app.graph.deadline import Deadline, invoke_llm, turn_deadline
+from app.graph.instrumentation import usage_metrics
+from app.core.metrics import (
+    DEADLINE_FALLBACKS,
+    GENERATION_ESCALATIONS,
+    GENERATION_TIER_SECONDS,
+    GENERATION_TIER_TOKENS,
+)
+from app.providers import get_provider_registry
 from app.config import get_settings
 
 settings = get_settings()
 
 
 class GenerationNode:
-    """LLM generation node using Google Gemini."""
+    """LLM generation node using Google Gemini.
 
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.LLM_MODEL,
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.7,
-        )
+    Each turn is answered by a model tier picked by ``choose_tier``: the fast
+    model for smalltalk and short lookups, the standard model otherwise.
+    """
 
+    def __init__(self):
         self.rag_prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -56,7 +67,14 @@ Guidelines:
             ]
         )
 
-    async def __call__(self, state: GraphState) -> GraphState:
+    @property
+    def llm(self):
+        return self.llm_for(STANDARD)
+
+    def llm_for(self, tier: str):
+        return get_provider_registry().chat_model(model=tier_model(tier), temperature=0.7)
+
+    async def __call__(self, state: GraphState, config: RunnableConfig) -> GraphState:
         """Generate a response using the LLM."""
         if state.get("has_context", False) and state.get("retrieved_chunks"):
             # RAG response with context
@@ -67,10 +85,8 @@ Guidelines:
                 ]
             )
 
-            chain = self.rag_prompt | self.llm
-            response = await chain.ainvoke(
-                {"context": context, "messages": state["messages"]}
-            )
+            prompt = self.rag_prompt
+            inputs = {"context": context, "messages": state["messages"]}
 
             sources = [
                 {
@@ -82,8 +98,85 @@ Guidelines:
             ]
         else:
             # General response without RAG
-            chain = self.general_prompt | self.llm
-            response = await chain.ainvoke({"messages": state["messages"]})
+            context = ""
+            prompt = self.general_prompt
+            inputs = {"messages": state["messages"]}
             sources = []
 
-        return {"response": response.content, "sources": sources}
+        choice = choose_tier(state, context_chars=len(context))
+        deadline = turn_deadline(config)
+        tier_metrics = {"tier": choice.tier, "model": choice.model, "tier_reason": choice.reason}
+        try:
+            response, call_metrics = await self._generate(choice.tier, prompt, inputs, deadline)
+        except TimeoutError:
+            DEADLINE_FALLBACKS.labels(step="generate").inc()
+            content = self._degraded_response(state)
+            return {
+                "response": content,
+                "sources": sources,
+                "messages": [AIMessage(content=content)],
+                "node_metrics": {
+                    "context_chunks": len(sources),
+                    **tier_metrics,
+                    "degraded": "deadline",
+                },
+            }
+
+        if (
+            choice.tier == FAST
+            and settings.LLM_ESCALATE_LOW_CONFIDENCE
+            and looks_low_confidence(response.content)
+        ):
+            GENERATION_ESCALATIONS.inc()
+            try:
+                response, call_metrics = await self._generate(STANDARD, prompt, inputs, deadline)
+                tier_metrics = {
+                    "tier": STANDARD,
+                    "model": tier_model(STANDARD),
+                    "tier_reason": "escalated",
+                }
+            except TimeoutError:
+                # Keep the fast answer rather than nothing
+                DEADLINE_FALLBACKS.labels(step="generate").inc()
+
+        return {
+            "response": response.content,
+            "sources": sources,
+            "messages": [AIMessage(content=response.content)],
+            "node_metrics": {
+                "context_chunks": len(sources),
+                **tier_metrics,
+                **call_metrics,
+                **usage_metrics(response),
+            },
+        }
+
+    async def _generate(self, tier: str, prompt, inputs: dict, deadline: Deadline):
+        """One generation call on the given tier, with per-tier metrics."""
+        llm = self.llm_for(tier)
+        start = time.perf_counter()
+        response, call_metrics = await invoke_llm(
+            "generate", llm, prompt | llm, inputs, deadline, tier=tier
+        )
+        GENERATION_TIER_SECONDS.labels(tier=tier).observe(time.perf_counter() - start)
+        for kind, count in usage_metrics(response).items():
+            if count:
+                GENERATION_TIER_TOKENS.labels(tier=tier, kind=kind).observe(count)
+        return response, call_metrics
+
+    @staticmethod
+    def _degraded_response(state: GraphState) -> str:
+        """Reply used when the turn runs out of time before the LLM answers."""
+        chunks = state.get("retrieved_chunks") or []
+        if not chunks:
+            return (
+                "Sorry, I couldn't put an answer together in time. "
+                "Please try asking again in a moment."
+            )
+        passages = "\n\n".join(
+            f"[{chunk['document_name']}]: {chunk['content'][:300]}" for chunk in chunks[:3]
+        )
+        return (
+            "I couldn't put a full answer together in time, but these passages "
+            f"from your notes look most relevant:\n\n{passages}"
+        )
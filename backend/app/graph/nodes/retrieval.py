@@ -3,6 +3,7 @@ from uuid import UUID
 from langchain_core.runnables import RunnableConfig
 
 from app.graph.state import GraphState
+from app.core.metrics import RETRIEVED_CHUNKS, RETRIEVAL_SIMILARITY
 from app.services.embedding import EmbeddingService
 
 
@@ -17,19 +18,21 @@ class RetrievalNode:
         if not state.get("needs_retrieval", False):
             return {"retrieved_chunks": [], "has_context": False}
 
-        # We pass the db session through a RunnableConfig because we want to reuse the same session/transaction across
-        # all nodes. We also do not want to pass db through GraphState because we need to keep GraphState serializable.
-        db = config["configurable"]["db"]
+        # We pass a session factory through a RunnableConfig rather than GraphState because GraphState must stay
+        # serializable. The session is only opened around the vector search, so the pooled connection is not
+        # held while the query is embedded or while the LLM nodes run.
+        session_factory = config["configurable"]["session_factory"]
         session_id = UUID(state["session_id"])
 
         # Perform similarity search
-        chunks = await self.embedding_service.similarity_search(
-            db=db,
-            session_id=session_id,
-            query=state["user_query"],
-            k=5,
-            score_threshold=0.5,
-        )
+        async with session_factory() as db:
+            chunks = await self.embedding_service.similarity_search(
+                db=db,
+                session_id=session_id,
+                query=state["user_query"],
+                k=5,
+                score_threshold=0.5,
+            )
 
         retrieved_chunks = [
             {
@@ -41,4 +44,15 @@ class RetrievalNode:
             for chunk in chunks
         ]
 
-        return {"retrieved_chunks": retrieved_chunks, "has_context": len(chunks) > 0}
+        RETRIEVED_CHUNKS.observe(len(chunks))
+        for chunk in chunks:
+            RETRIEVAL_SIMILARITY.observe(chunk.similarity)
+
+        return {
+            "retrieved_chunks": retrieved_chunks,
+            "has_context": len(chunks) > 0,
+            "node_metrics": {
+                "chunks": len(chunks),
+                "similarities": [round(chunk.similarity, 4) for chunk in chunks],
+            },
+        }
@@ -1,7 +1,11 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 
 from app.graph.state import GraphState
+from app.graph.deadline import invoke_llm, turn_deadline
+from app.graph.instrumentation import usage_metrics
+from app.core.metrics import DEADLINE_FALLBACKS
+from app.providers import ROUTING, get_provider_registry
 from app.config import get_settings
 
 settings = get_settings()
@@ -11,11 +15,6 @@ class QueryRouterNode:
     """Routes queries to determine if RAG retrieval is needed."""
 
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0,
-        )
         self.prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -41,13 +40,36 @@ Respond with ONLY 'retrieve' or 'direct', nothing else.""",
             ]
         )
 
-    async def __call__(self, state: GraphState) -> GraphState:
+    @property
+    def llm(self):
+        return get_provider_registry().chat_model(model="gemini-2.0-flash", temperature=0)
+
+    async def __call__(self, state: GraphState, config: RunnableConfig) -> GraphState:
         """Route the query based on content analysis."""
         # If no documents exist, skip retrieval
         if not state.get("has_documents", False):
-            return {"needs_retrieval": False}
+            return {"needs_retrieval": False, "node_metrics": {"skipped": True}}
 
-        chain = self.prompt | self.llm
-        result = await chain.ainvoke({"query": state["user_query"]})
+        llm = self.llm
+        try:
+            result, call_metrics = await invoke_llm(
+                "route_query",
+                llm,
+                self.prompt | llm,
+                {"query": state["user_query"]},
+                turn_deadline(config),
+                priority=ROUTING,
+                cap=settings.ROUTER_TIMEOUT_SECONDS,
+            )
+        except TimeoutError:
+            # Out of time: searching the notes is the safer default
+            DEADLINE_FALLBACKS.labels(step="route_query").inc()
+            return {
+                "needs_retrieval": True,
+                "node_metrics": {"decision": "retrieve", "degraded": "deadline"},
+            }
         decision = result.content.strip().lower()
-        return {"needs_retrieval": decision == "retrieve"}
+        return {
+            "needs_retrieval": decision == "retrieve",
+            "node_metrics": {"decision": decision, **call_metrics, **usage_metrics(result)},
+        }
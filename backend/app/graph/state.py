@@ -25,3 +25,6 @@ class GraphState(TypedDict):
     # Response
     response: str | None
     sources: list[dict]
+
+    # Per-step timings and token counts for the current turn
+    turn_metrics: dict
@@ -1,14 +1,21 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 logging.basicConfig(level=logging.INFO)
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.config import get_settings
-from app.db.database import init_db
+from app.db.database import init_db, open_psycopg_pool, close_psycopg_pool
+from app.graph.checkpoint import setup_checkpointer, reset_checkpointer, run_checkpoint_pruner
+from app.providers import get_provider_registry
+from app.core.events import get_event_broker
+from app.core.metrics import render_metrics
+from app.services.files import run_file_gc, wait_for_discards
+from app.services.stats import run_session_stats_repair
 
 settings = get_settings()
 
@@ -20,9 +27,49 @@ async def lifespan(app: FastAPI):
     print("Initializing database...")
     await init_db()
     print("Database initialized.")
+    pruner = None
+    if settings.CHAT_CHECKPOINTS_ENABLED:
+        print("Setting up conversation checkpointer...")
+        await setup_checkpointer(await open_psycopg_pool())
+        pruner = asyncio.create_task(
+            run_checkpoint_pruner(
+                settings.CHECKPOINT_PRUNE_INTERVAL_SECONDS, settings.CHECKPOINT_KEEP_LAST
+            )
+        )
+    stats_repair = None
+    if settings.SESSION_STATS_REPAIR_INTERVAL_SECONDS > 0:
+        stats_repair = asyncio.create_task(
+            run_session_stats_repair(settings.SESSION_STATS_REPAIR_INTERVAL_SECONDS)
+        )
+    file_gc = None
+    if settings.FILE_GC_INTERVAL_SECONDS > 0:
+        file_gc = asyncio.create_task(
+            run_file_gc(settings.FILE_GC_INTERVAL_SECONDS, settings.FILE_GC_GRACE_SECONDS)
+        )
+    if settings.WARM_UP_GRAPH:
+        # Deferred import: the graph pulls in LangGraph and the Gemini clients
+        from app.graph.graph import get_study_buddy_graph
+
+        print("Warming up conversation graph...")
+        get_study_buddy_graph().warm_up()
+        print("Conversation graph ready.")
+    if settings.PROVIDER_WARMUP_REQUEST:
+        print("Warming up provider connections...")
+        await get_provider_registry().warm_up()
     yield
     # Shutdown
     print("Shutting down AI Study Buddy API...")
+    await get_provider_registry().aclose()
+    await get_event_broker().close()
+    if pruner is not None:
+        pruner.cancel()
+    if stats_repair is not None:
+        stats_repair.cancel()
+    if file_gc is not None:
+        file_gc.cancel()
+    await wait_for_discards()
+    reset_checkpointer()
+    await close_psycopg_pool()
 
 
 app = FastAPI(
@@ -49,3 +96,17 @@ app.include_router(api_router)
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/health/providers")
+async def provider_health():
+    """Connection stats for the shared provider clients and the scheduler."""
+    registry = get_provider_registry()
+    return {"clients": registry.stats(), "scheduler": registry.scheduler.stats()}
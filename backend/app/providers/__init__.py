@@ -0,0 +1,17 @@
+from app.providers.registry import ClientStats, ProviderRegistry, get_provider_registry
+from app.providers.scheduler import (
+    INGESTION,
+    INTERACTIVE,
+    ROUTING,
+    ProviderScheduler,
+)
+
+__all__ = [
+    "INGESTION",
+    "INTERACTIVE",
+    "ROUTING",
+    "ClientStats",
+    "ProviderScheduler",
+    "ProviderRegistry",
+    "get_provider_registry",
+]
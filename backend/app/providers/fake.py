@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.config import get_settings
+
+settings = get_settings()
+
+_WORD = re.compile(r"\w+")
+# "Respond with ONLY 'retrieve' or 'direct'" style instructions
+_CHOICE = re.compile(r"respond with only '([^']+)'", re.IGNORECASE)
+
+_CANNED_ANSWERS = [
+    "Good question. The key idea is that each step builds on the previous one, "
+    "so it helps to work through a small example by hand before generalising. "
+    "Start from the definition, check which assumptions hold, and then apply "
+    "the result to your problem. If one step still feels hard, ask about it "
+    "and we can go through it together.",
+    "Here is a short summary. The concept describes how a system changes when "
+    "one of its inputs is varied while the others are held fixed. In practice "
+    "you identify the input, measure the response, and compare it with what the "
+    "model predicts. Reviewing the worked examples in your notes is a good way "
+    "to consolidate this.",
+    "Think of it in three parts: what is given, what is asked, and which rule "
+    "connects them. Once the rule is clear the calculation is usually short. "
+    "Try writing down each part separately, then combine them, and check that "
+    "the units and the order of magnitude of your answer make sense.",
+]
+
+
+class FakeProviderError(RuntimeError):
+    """Injected provider failure."""
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic feature-hashing embeddings.
+
+    Each word is hashed to a signed position in a vector of ``size``
+    dimensions, so texts sharing words get similar vectors and retrieval
+    ranks sensibly. A constant component is mixed in to lift cosine
+    similarities into the range the retrieval score threshold expects:
+    unrelated texts score about 0.45, texts with shared words higher.
+    """
+
+    def __init__(self, size: int, latency: float = 0.0):
+        self.size = size
+        self.latency = latency
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.size
+        words = _WORD.findall(text.lower()) or [text]
+        for word in words:
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % (self.size - 1) + 1
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        vector = [v / norm for v in vector]
+        vector[0] = 0.9
+        norm = math.sqrt(1 + 0.81)
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self._embed(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that streams canned text with injected latency and errors.
+
+    ``latency`` is the time to the first token (jittered by
+    ``latency_jitter``, and ``stall_seconds`` instead for a ``stall_rate``
+    share of calls); the answer then streams at ``tokens_per_second`` (0 for
+    all at once). A share ``error_rate`` of calls fails with
+    FakeProviderError. Prompts asking for one of a fixed set of words (the
+    query router) get the first option.
+    """
+
+    model: str = "fake"
+    latency: float = 0.2
+    latency_jitter: float = 0.0
+    stall_rate: float = 0.0
+    stall_seconds: float = 0.0
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model}
+
+    def _first_token_delay(self) -> float:
+        if self.stall_rate and random.random() < self.stall_rate:
+            return self.stall_seconds
+        return self.latency * (1 + self.latency_jitter * random.uniform(-1, 1))
+
+    def _reply(self, messages: list[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        choice = _CHOICE.search(prompt)
+        if choice:
+            return choice.group(1)
+        digest = hashlib.blake2b(str(messages[-1].content).encode(), digest_size=2).digest()
+        return _CANNED_ANSWERS[int.from_bytes(digest, "little") % len(_CANNED_ANSWERS)]
+
+    def _chunks(self, messages: list[BaseMessage]) -> tuple[list[str], dict]:
+        if self.error_rate and random.random() < self.error_rate:
+            raise FakeProviderError("injected provider error")
+        words = self._reply(messages).split(" ")
+        tokens = [w if i == 0 else f" {w}" for i, w in enumerate(words)]
+        prompt_tokens = sum(len(_WORD.findall(str(m.content))) for m in messages)
+        usage = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        return tokens, usage
+
+    def _stream(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self._first_token_delay())
+        tokens, usage = self._chunks(messages)
+        for i, token in enumerate(tokens):
+            if i and self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+            chunk = AIMessageChunk(content=token)
+            if i == len(tokens) - 1:
+                chunk.usage_metadata = usage
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._first_token_delay())
+        tokens, usage = self._chunks(messages)
+        for i, token in enumerate(tokens):
+            if i and self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = AIMessageChunk(content=token)
+            if i == len(tokens) - 1:
+                chunk.usage_metadata = usage
+            yield ChatGenerationChunk(message=chunk)
+
+    @staticmethod
+    def _result(chunks: list[ChatGenerationChunk]) -> ChatResult:
+        message = chunks[0].message
+        for chunk in chunks[1:]:
+            message = message + chunk.message
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(
+                        content=message.content, usage_metadata=message.usage_metadata
+                    )
+                )
+            ]
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return self._result(list(self._stream(messages)))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return self._result([chunk async for chunk in self._astream(messages)])
+
+
+class FakeProvider:
+    """Offline stand-in provider, selected with LLM_PROVIDER=fake.
+
+    Needs no network or API key, so load tests and benchmarks measure our own
+    overhead rather than the provider's. Clients are configured from the
+    FAKE_* settings.
+    """
+
+    name = "fake"
+
+    def chat_model(self, model: str, temperature: float) -> FakeChatModel:
+        return FakeChatModel(
+            model=model,
+            latency=settings.FAKE_LLM_LATENCY_SECONDS,
+            latency_jitter=settings.FAKE_LLM_LATENCY_JITTER,
+            stall_rate=settings.FAKE_LLM_STALL_RATE,
+            stall_seconds=settings.FAKE_LLM_STALL_SECONDS,
+            tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND,
+            error_rate=settings.FAKE_LLM_ERROR_RATE,
+        )
+
+    def embeddings(self) -> FakeEmbeddings:
+        return FakeEmbeddings(
+            size=settings.EMBEDDING_DIMENSION,
+            latency=settings.FAKE_EMBEDDING_LATENCY_SECONDS,
+        )
@@ -0,0 +1,28 @@
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class GoogleProvider:
+    """Gemini chat and embedding clients (langchain-google-genai)."""
+
+    name = "google"
+
+    def chat_model(self, model: str, temperature: float):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=settings.GOOGLE_API_KEY,
+            temperature=temperature,
+            transport=settings.PROVIDER_TRANSPORT,
+        )
+
+    def embeddings(self):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        return GoogleGenerativeAIEmbeddings(
+            model=settings.EMBEDDING_MODEL,
+            google_api_key=settings.GOOGLE_API_KEY,
+            transport=settings.PROVIDER_TRANSPORT,
+        )
@@ -0,0 +1,94 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling window of recent successful call latencies, per call site."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._samples)
+
+    def quantile(self, key: str, q: float, min_samples: int = 1) -> float | None:
+        """The q-quantile of recent latencies, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+
+@lru_cache()
+def get_latency_tracker() -> LatencyTracker:
+    return LatencyTracker()
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    timeout: float,
+    hedge_after: float | None = None,
+) -> tuple[T, str | None]:
+    """Run ``call`` within ``timeout`` seconds, hedging once if it is slow.
+
+    If the first attempt has not finished after ``hedge_after`` seconds a
+    second, identical attempt is started and whichever succeeds first wins;
+    the other is cancelled. Returns the result and which attempt produced it
+    ("primary" or "hedge"), or None as the winner when no hedge was sent.
+    Raises TimeoutError when no attempt succeeds in time, or the error of the
+    last failed attempt.
+    """
+    if timeout <= 0:
+        raise TimeoutError("deadline already passed")
+
+    start = time.monotonic()
+    primary = asyncio.create_task(call())
+    pending = {primary}
+    hedge_sent = False
+    error: BaseException | None = None
+    try:
+        while pending:
+            elapsed = time.monotonic() - start
+            if elapsed >= timeout:
+                raise TimeoutError(f"no response within {timeout:.2f}s")
+            wait = timeout - elapsed
+            if not hedge_sent and hedge_after is not None:
+                wait = min(wait, max(hedge_after - elapsed, 0))
+
+            done, pending = await asyncio.wait(
+                pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    winner = None if not hedge_sent else ("primary" if task is primary else "hedge")
+                    return task.result(), winner
+                error = task.exception()
+
+            if (
+                pending
+                and not hedge_sent
+                and hedge_after is not None
+                and time.monotonic() - start >= hedge_after
+            ):
+                pending.add(asyncio.create_task(call()))
+                hedge_sent = True
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.config import get_settings
+from app.providers.scheduler import INGESTION, INTERACTIVE, ROUTING, ProviderScheduler
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClientStats:
+    """Connection and request counters for one shared provider client."""
+
+    name: str
+    created_at: datetime
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    total_seconds: float = 0.0
+    last_used_at: datetime | None = None
+
+
+class ProviderRegistry:
+    """Process-wide cache of provider clients.
+
+    Each distinct client configuration is built once and then shared by chat
+    and ingestion, so every caller reuses the same underlying transport (a
+    long-lived gRPC channel by default, or a pooled keep-alive HTTP session when
+    PROVIDER_TRANSPORT is "rest") instead of paying a fresh TLS handshake.
+    Every request also passes through the shared scheduler, see ``track``.
+    Clients are built by the backend named by LLM_PROVIDER.
+    """
+
+    def __init__(self):
+        self.backend = get_backend(settings.LLM_PROVIDER)
+        self._clients: dict[str, Any] = {}
+        self._names: dict[int, str] = {}
+        self._stats: dict[str, ClientStats] = {}
+        self._lock = threading.Lock()
+        self.scheduler = ProviderScheduler(
+            max_concurrency=settings.PROVIDER_MAX_CONCURRENCY,
+            class_limits={
+                INTERACTIVE: settings.PROVIDER_INTERACTIVE_CONCURRENCY,
+                ROUTING: settings.PROVIDER_ROUTING_CONCURRENCY,
+                INGESTION: settings.PROVIDER_INGESTION_CONCURRENCY,
+            },
+            quota_per_minute=settings.PROVIDER_QUOTA_PER_MINUTE,
+            ingestion_quota_reserve=settings.PROVIDER_INGESTION_QUOTA_RESERVE,
+        )
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = factory()
+                self._clients[name] = client
+                self._names[id(client)] = name
+                self._stats[name] = ClientStats(
+                    name=name, created_at=datetime.now(timezone.utc)
+                )
+                logger.info("Created provider client %s", name)
+        return client
+
+    def chat_model(self, model: str, temperature: float):
+        """Get the shared chat model client for a model/temperature pair."""
+        return self._get_or_create(
+            f"chat:{model}:t={temperature}",
+            lambda: self.backend.chat_model(model, temperature),
+        )
+
+    def embeddings(self):
+        """Get the shared embeddings client for the configured model."""
+        return self._get_or_create(
+            f"embeddings:{settings.EMBEDDING_MODEL}", self.backend.embeddings
+        )
+
+    @asynccontextmanager
+    async def track(self, client: Any, priority: str = INTERACTIVE, cost: int = 1):
+        """Schedule and record a request made through a registry client.
+
+        Waits for a scheduler slot in the given priority class; ``cost`` is the
+        number of quota units the request spends (texts, for embeddings).
+        """
+        async with self.scheduler.slot(priority, cost):
+            async with self._record(client):
+                yield
+
+    @asynccontextmanager
+    async def _record(self, client: Any):
+        stats = self._stats.get(self._names.get(id(client), ""))
+        if stats is None:
+            yield
+            return
+
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.last_used_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.total_seconds += time.perf_counter() - start
+
+    def stats(self) -> list[dict]:
+        """Return a snapshot of per-client connection stats."""
+        snapshot = []
+        for stats in self._stats.values():
+            data = asdict(stats)
+            data["avg_seconds"] = (
+                stats.total_seconds / stats.requests if stats.requests else None
+            )
+            snapshot.append(data)
+        return snapshot
+
+    async def warm_up(self) -> None:
+        """Send one cheap request through every client to open its connection."""
+        for name, client in list(self._clients.items()):
+            try:
+                async with self.track(client, priority=ROUTING):
+                    if name.startswith("embeddings:"):
+                        await client.aembed_query("warm-up")
+                    else:
+                        await client.ainvoke("ping")
+                logger.info("Warmed up provider client %s", name)
+            except Exception as e:
+                logger.warning("Warm-up request for %s failed: %s", name, e)
+
+    async def aclose(self) -> None:
+        """Close every client's transport and forget the clients."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._names.clear()
+            self._stats.clear()
+
+        for client in clients:
+            sync_client = getattr(client, "client", None)
+            if sync_client is not None:
+                sync_client.transport.close()
+            async_client = getattr(client, "async_client_running", None)
+            if async_client is not None:
+                await async_client.transport.close()
+
+
+def get_backend(name: str):
+    """Return the provider backend for an LLM_PROVIDER value."""
+    if name == "google":
+        from app.providers.google import GoogleProvider
+
+        return GoogleProvider()
+    if name == "fake":
+        from app.providers.fake import FakeProvider
+
+        return FakeProvider()
+    raise ValueError(f"Unknown LLM_PROVIDER: {name!r} (expected 'google' or 'fake')")
+
+
+@lru_cache()
+def get_provider_registry() -> ProviderRegistry:
+    return ProviderRegistry()
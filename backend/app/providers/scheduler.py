@@ -0,0 +1,175 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from app.core.metrics import (
+    PROVIDER_QUEUE_DEPTH,
+    PROVIDER_QUEUE_WAIT_SECONDS,
+    PROVIDER_QUOTA_USED,
+)
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"
+ROUTING = "routing"
+INGESTION = "ingestion"
+PRIORITIES = (INTERACTIVE, ROUTING, INGESTION)
+
+
+class ProviderScheduler:
+    """Admission control for every request sent to the model provider.
+
+    Requests wait in one FIFO queue per priority class and are admitted
+    highest class first, subject to a global concurrency limit, a per-class
+    concurrency cap and an optional per-minute quota (a token bucket shared
+    by all classes). A request is charged its ``cost`` in quota units: one
+    per generation call, one per text embedded. Ingestion never spends the
+    last ``ingestion_quota_reserve`` share of the bucket, so chat keeps some
+    quota in hand while a large upload is being embedded.
+
+    A request costing more than its class could ever find in the bucket (the
+    whole quota, or for ingestion the share outside the reserve) is charged
+    that ceiling instead, so oversized batches are slowed but never stuck.
+
+    A concurrency limit of 0, global or per class, means no cap.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        class_limits: dict[str, int],
+        quota_per_minute: int = 0,
+        ingestion_quota_reserve: float = 0.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.class_limits = class_limits
+        self.quota_per_minute = quota_per_minute
+        self.ingestion_quota_reserve = ingestion_quota_reserve
+
+        self._waiters: dict[str, deque] = {p: deque() for p in PRIORITIES}
+        self._in_flight = {p: 0 for p in PRIORITIES}
+        self._quota_used = {p: 0 for p in PRIORITIES}
+        self._tokens = float(quota_per_minute)
+        self._refilled_at = time.monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @asynccontextmanager
+    async def slot(self, priority: str, cost: int = 1):
+        """Wait for an admission slot, hold it for the body of the block."""
+        waiter = (asyncio.get_running_loop().create_future(), cost)
+        queue = self._waiters[priority]
+        queue.append(waiter)
+        PROVIDER_QUEUE_DEPTH.labels(priority=priority).inc()
+        start = time.perf_counter()
+        self._dispatch()
+
+        try:
+            await waiter[0]
+        except asyncio.CancelledError:
+            if waiter in queue:
+                queue.remove(waiter)
+                PROVIDER_QUEUE_DEPTH.labels(priority=priority).dec()
+            elif not waiter[0].cancelled():
+                # Admitted just before the caller was cancelled
+                self._release(priority)
+            raise
+        PROVIDER_QUEUE_WAIT_SECONDS.labels(priority=priority).observe(
+            time.perf_counter() - start
+        )
+
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def _release(self, priority: str) -> None:
+        self._in_flight[priority] -= 1
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self.quota_per_minute / 60
+        self._tokens = min(
+            float(self.quota_per_minute),
+            self._tokens + (now - self._refilled_at) * rate,
+        )
+        self._refilled_at = now
+
+    def _charge(self, priority: str, cost: int) -> float:
+        """Quota units taken from the bucket by a request of ``cost``."""
+        ceiling = float(self.quota_per_minute)
+        if priority == INGESTION:
+            ceiling *= 1 - self.ingestion_quota_reserve
+        return min(float(cost), ceiling)
+
+    def _quota_shortfall(self, priority: str, cost: int) -> float:
+        """Tokens still missing before a request of ``cost`` may start."""
+        if self.quota_per_minute <= 0:
+            return 0.0
+        needed = self._charge(priority, cost)
+        if priority == INGESTION:
+            needed += self.ingestion_quota_reserve * self.quota_per_minute
+        # Never more than the bucket holds, rounding included
+        needed = min(needed, float(self.quota_per_minute))
+        return max(0.0, needed - self._tokens)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.quota_per_minute > 0:
+            self._refill()
+
+        for priority in PRIORITIES:
+            queue = self._waiters[priority]
+            while queue:
+                future, cost = queue[0]
+                if future.done():
+                    # Cancelled while queued
+                    queue.popleft()
+                    PROVIDER_QUEUE_DEPTH.labels(priority=priority).dec()
+                    continue
+                if 0 < self.max_concurrency <= sum(self._in_flight.values()):
+                    return
+                if 0 < self.class_limits[priority] <= self._in_flight[priority]:
+                    # Class is at its cap; lower classes may use the headroom
+                    break
+                shortfall = self._quota_shortfall(priority, cost)
+                if shortfall > 0:
+                    # Out of quota: hold everything below so this class is
+                    # first in line once the bucket refills
+                    delay = shortfall / (self.quota_per_minute / 60)
+                    self._timer = asyncio.get_running_loop().call_later(
+                        delay, self._dispatch
+                    )
+                    return
+
+                queue.popleft()
+                PROVIDER_QUEUE_DEPTH.labels(priority=priority).dec()
+                if self.quota_per_minute > 0:
+                    self._tokens -= self._charge(priority, cost)
+                self._quota_used[priority] += cost
+                PROVIDER_QUOTA_USED.labels(priority=priority).inc(cost)
+                self._in_flight[priority] += 1
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        """Return a snapshot of queue depths, in-flight counts and quota use."""
+        if self.quota_per_minute > 0:
+            self._refill()
+        return {
+            "max_concurrency": self.max_concurrency or None,
+            "quota_per_minute": self.quota_per_minute or None,
+            "quota_available": (
+                round(self._tokens, 1) if self.quota_per_minute > 0 else None
+            ),
+            "classes": {
+                p: {
+                    "limit": self.class_limits[p] or None,
+                    "in_flight": self._in_flight[p],
+                    "queued": len(self._waiters[p]),
+                    "quota_used": self._quota_used[p],
+                }
+                for p in PRIORITIES
+            },
+        }
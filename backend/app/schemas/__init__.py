@@ -14,6 +14,9 @@ from app.schemas.session import (
     SessionUpdate,
     SessionResponse,
     SessionListResponse,
+    SessionStats,
+    SessionSummary,
+    SessionDashboardResponse,
 )
 from app.schemas.document import (
     DocumentResponse,
@@ -28,6 +31,8 @@ from app.schemas.message import (
     SourceReference,
 )
 from app.schemas.note import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from app.schemas.sync import SessionChangesResponse
+from app.schemas.bulk import BulkRequest, BulkPinRequest, BulkArchiveRequest, BulkResult
 
 __all__ = [
     "UserCreate",
@@ -45,6 +50,9 @@ __all__ = [
     "SessionUpdate",
     "SessionResponse",
     "SessionListResponse",
+    "SessionStats",
+    "SessionSummary",
+    "SessionDashboardResponse",
     "DocumentResponse",
     "DocumentListResponse",
     "DocumentStatusResponse",
@@ -57,4 +65,9 @@ __all__ = [
     "NoteUpdate",
     "NoteResponse",
     "NoteListResponse",
+    "SessionChangesResponse",
+    "BulkRequest",
+    "BulkPinRequest",
+    "BulkArchiveRequest",
+    "BulkResult",
 ]
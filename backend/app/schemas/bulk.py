@@ -0,0 +1,32 @@
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+# Largest number of ids accepted by one bulk request
+MAX_BULK_IDS = 500
+
+
+class BulkRequest(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_IDS)
+
+
+class BulkPinRequest(BulkRequest):
+    pin: bool = True
+
+
+class BulkArchiveRequest(BulkRequest):
+    archive: bool = True
+
+
+class BulkResult(BaseModel):
+    # Rows deleted or updated
+    affected: int
+    # Requested ids that do not exist or belong to someone else; nothing was done for them
+    not_found: list[UUID] = []
+
+    @classmethod
+    def of(cls, requested: list[UUID], affected: list[UUID]) -> "BulkResult":
+        done = set(affected)
+        return cls(
+            affected=len(done),
+            not_found=[i for i in dict.fromkeys(requested) if i not in done],
+        )
@@ -16,6 +16,7 @@ class DocumentResponse(DocumentBase):
     processing_status: str
     processing_error: str | None
     chunk_count: int
+    processing_metrics: dict | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -25,7 +26,10 @@ class DocumentResponse(DocumentBase):
 
 class DocumentListResponse(BaseModel):
     documents: list[DocumentResponse]
-    total: int
+    # Omitted unless requested (or on offset pages); see include_total
+    total: int | None = None
+    # Pass as ?cursor= to get the next page; None on the last page
+    next_cursor: str | None = None
 
 
 class DocumentStatusResponse(BaseModel):
@@ -33,3 +37,4 @@ class DocumentStatusResponse(BaseModel):
     processing_status: str
     processing_error: str | None
     chunk_count: int
+    processing_metrics: dict | None = None
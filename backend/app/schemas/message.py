@@ -34,4 +34,7 @@ class ChatResponse(BaseModel):
 
 class MessageListResponse(BaseModel):
     messages: list[ChatMessageResponse]
-    total: int
+    # Omitted unless requested (or on offset pages); see include_total
+    total: int | None = None
+    # Pass as ?cursor= to get the next page; None on the last page
+    next_cursor: str | None = None
@@ -31,4 +31,7 @@ class NoteResponse(NoteBase):
 
 class NoteListResponse(BaseModel):
     notes: list[NoteResponse]
-    total: int
+    # Omitted unless requested (or on offset pages); see include_total
+    total: int | None = None
+    # Pass as ?cursor= to get the next page; None on the last page
+    next_cursor: str | None = None
@@ -33,4 +33,30 @@ class SessionResponse(SessionBase):
 
 class SessionListResponse(BaseModel):
     sessions: list[SessionResponse]
-    total: int
+    # Omitted unless requested (or on offset pages); see include_total
+    total: int | None = None
+    # Pass as ?cursor= to get the next page; None on the last page
+    next_cursor: str | None = None
+
+
+class SessionStats(BaseModel):
+    document_count: int = 0
+    # Documents by processing state; pending uploads count as processing
+    completed_document_count: int = 0
+    processing_document_count: int = 0
+    failed_document_count: int = 0
+    note_count: int = 0
+    message_count: int = 0
+    last_message_at: datetime | None = None
+
+
+class SessionSummary(SessionResponse):
+    stats: SessionStats
+
+
+class SessionDashboardResponse(BaseModel):
+    sessions: list[SessionSummary]
+    # Omitted unless requested (or on offset pages); see include_total
+    total: int | None = None
+    # Pass as ?cursor= to get the next page; None on the last page
+    next_cursor: str | None = None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from app.schemas.document import DocumentResponse
+from app.schemas.message import ChatMessageResponse
+
+
+class SessionChangesResponse(BaseModel):
+    # Messages written since the cursor, in sync order (oldest first)
+    messages: list[ChatMessageResponse]
+    # Documents uploaded or updated (e.g. a status transition) since the cursor
+    documents: list[DocumentResponse]
+    # Pass as ?since= on the next sync
+    cursor: str
+    # More messages are waiting; sync again right away
+    has_more: bool = False
+    # A full load (no cursor, or one from before a deletion): replace the
+    # cached messages and documents rather than merging into them
+    full: bool = False
@@ -2,16 +2,17 @@ import hashlib
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import logging
 
 from app.db.models import User, RefreshToken, PasswordResetToken
 from app.schemas import UserCreate, UserResponse, TokenResponse, AuthResponse
+from app.core.auth_cache import get_auth_cache
 from app.core.security import (
     hash_password,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
@@ -43,7 +44,7 @@ class AuthService:
         """Create a new user."""
         user = User(
             email=user_data.email,
-            hashed_password=hash_password(user_data.password),
+            hashed_password=await hash_password(user_data.password),
             full_name=user_data.full_name,
         )
         db.add(user)
@@ -57,10 +58,15 @@ class AuthService:
         user = await AuthService.get_user_by_email(db, email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, updated_hash = await verify_and_update_password(password, user.hashed_password)
+        if not verified:
             return None
         if not user.is_active:
             return None
+        if updated_hash:
+            # Hashed with older Argon2 parameters; upgrade while we have the password
+            user.hashed_password = updated_hash
+            await db.commit()
         return user
 
     @staticmethod
@@ -125,9 +131,22 @@ class AuthService:
         if token_record:
             token_record.revoked = True
             await db.commit()
+            get_auth_cache().forget_user(token_record.user_id)
             return True
         return False
 
+    @staticmethod
+    async def deactivate_user(db: AsyncSession, user: User) -> None:
+        """Deactivate a user and revoke their refresh tokens."""
+        user.is_active = False
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user.id, RefreshToken.revoked == False)
+            .values(revoked=True)
+        )
+        await db.commit()
+        get_auth_cache().forget_user(user.id)
+
     @staticmethod
     async def register_and_login(db: AsyncSession, user_data: UserCreate) -> AuthResponse:
         """Register a new user and return auth response with tokens."""
@@ -203,8 +222,9 @@ class AuthService:
             return False
 
         # Update password and mark token as used
-        user.hashed_password = hash_password(new_password)
+        user.hashed_password = await hash_password(new_password)
         token_record.used = True
         await db.commit()
+        get_auth_cache().forget_user(user.id)
 
         return True
@@ -1,8 +1,11 @@
+from functools import partial
 from uuid import UUID
 
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import paginate
+from app.db.database import AsyncSessionLocal
 from app.db.models import ChatMessage
 from app.schemas import (
     ChatMessageResponse,
@@ -10,7 +13,12 @@ from app.schemas import (
     MessageListResponse,
     SourceReference,
 )
-from app.graph.graph import study_buddy_graph
+from app.graph.checkpoint import delete_thread
+from app.services.stats import SessionStatsService
+from app.services.versions import bump_sync_version
+from app.config import get_settings
+
+settings = get_settings()
 
 
 class ChatService:
@@ -39,20 +47,39 @@ class ChatService:
         user_id: UUID,
         content: str,
     ) -> ChatResponse:
-        """Process a user message and generate AI response."""
-        # Get conversation history for context
-        history = await ChatService.get_conversation_history(db, session_id, limit=10)
+        """Process a user message and generate AI response.
+
+        The turn is split into short database units so that no pooled
+        connection is held while the LLM works: read the history and document
+        state, release the connection, run routing/retrieval/generation (the
+        retrieval node opens its own brief session), then persist both
+        messages in a new short transaction.
+        """
+        # Imported here so workers that never chat skip loading LangGraph/LangChain
+        from app.graph.graph import get_study_buddy_graph
+
+        graph = get_study_buddy_graph()
 
-        # Run the LangGraph
-        result = await study_buddy_graph.run(
+        # 1. Read unit
+        turn = await graph.prepare_turn(
             db=db,
             session_id=session_id,
             user_id=user_id,
             user_query=content,
-            conversation_history=history,
+            load_history=partial(
+                ChatService.get_conversation_history,
+                db,
+                session_id,
+                limit=settings.CHAT_HISTORY_WINDOW,
+            ),
         )
+        # End the read transaction so the connection goes back to the pool
+        await db.commit()
+
+        # 2. Route, retrieve and generate without holding a connection
+        result = await graph.execute_turn(turn, session_factory=AsyncSessionLocal)
 
-        # Save user message
+        # 3. Write unit: save user and assistant messages
         user_message = ChatMessage(
             session_id=session_id,
             user_id=user_id,
@@ -62,7 +89,6 @@ class ChatService:
         )
         db.add(user_message)
 
-        # Save assistant message
         sources_data = [
             {
                 "chunk_id": s["chunk_id"],
@@ -78,12 +104,15 @@ class ChatService:
             role="assistant",
             content=result["response"],
             sources=sources_data,
+            message_metadata={"turn_metrics": result["metrics"]},
         )
         db.add(assistant_message)
+        await SessionStatsService.adjust(db, session_id, message_count=2)
+        sync_version = await bump_sync_version(db, session_id)
+        user_message.sync_version = assistant_message.sync_version = sync_version
 
+        # Primary keys are generated client-side, so no refresh round trips
         await db.commit()
-        await db.refresh(user_message)
-        await db.refresh(assistant_message)
 
         return ChatResponse(
             user_message_id=user_message.id,
@@ -101,47 +130,62 @@ class ChatService:
 
     @staticmethod
     async def list_messages(
-        db: AsyncSession, session_id: UUID, skip: int = 0, limit: int = 50
+        db: AsyncSession,
+        session_id: UUID,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> MessageListResponse:
-        """List all messages for a session."""
+        """List messages for a session, oldest first."""
         query = select(ChatMessage).where(ChatMessage.session_id == session_id)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Get paginated results
-        query = query.order_by(ChatMessage.created_at.asc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        messages = result.scalars().all()
+        # The maintained counter; paginate counts only if the session has none yet
+        total = None
+        if include_total:
+            total = await SessionStatsService.get_count(db, session_id, "message_count")
+        messages, next_cursor, total = await paginate(
+            db,
+            query,
+            [ChatMessage.created_at, ChatMessage.id],
+            descending=False,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            total=total,
+        )
 
         return MessageListResponse(
-            messages=[
-                ChatMessageResponse(
-                    id=msg.id,
-                    session_id=msg.session_id,
-                    role=msg.role,
-                    content=msg.content,
-                    sources=[
-                        SourceReference(
-                            chunk_id=s.get("chunk_id", ""),
-                            document_name=s.get("document_name", ""),
-                            similarity=s.get("similarity", 0.0),
-                        )
-                        for s in (msg.sources or [])
-                    ],
-                    created_at=msg.created_at,
+            messages=[ChatService.message_response(msg) for msg in messages],
+            total=total,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def message_response(msg: ChatMessage) -> ChatMessageResponse:
+        return ChatMessageResponse(
+            id=msg.id,
+            session_id=msg.session_id,
+            role=msg.role,
+            content=msg.content,
+            sources=[
+                SourceReference(
+                    chunk_id=s.get("chunk_id", ""),
+                    document_name=s.get("document_name", ""),
+                    similarity=s.get("similarity", 0.0),
                 )
-                for msg in messages
+                for s in (msg.sources or [])
             ],
-            total=total,
+            created_at=msg.created_at,
         )
 
     @staticmethod
     async def clear_messages(db: AsyncSession, session_id: UUID) -> None:
         """Clear all messages for a session."""
-        await db.execute(
+        result = await db.execute(
             delete(ChatMessage).where(ChatMessage.session_id == session_id)
         )
+        await SessionStatsService.adjust(db, session_id, message_count=-result.rowcount)
+        await bump_sync_version(db, session_id, deletion=True)
         await db.commit()
+        await delete_thread(session_id)
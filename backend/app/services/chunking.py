@@ -0,0 +1,127 @@
+from typing import Iterable, Iterator
+
+# Cut points in order of preference, as in the character splitter this replaces
+SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate subword token count of a text.
+
+    About one token per four characters of each word, rounded up, which is
+    close to the Gemini tokenizer on English prose, without needing the
+    tokenizer itself.
+    """
+    words = text.split()
+    return (sum(map(len, words)) + 2 * len(words) + 3) // 4
+
+
+def _units(text: str, start: int, end: int) -> int:
+    """Size of ``text[start:end]`` in quarter tokens, less the 2 of its last word.
+
+    Characters plus whitespace characters: every word after the first has
+    whitespace before it, so this plus 2 is never less than
+    ``estimate_tokens`` in quarter tokens, equal for single-spaced text,
+    and it adds up over consecutive stretches.
+    """
+    return end - start + text.count(" ", start, end) + text.count("\n", start, end)
+
+
+class TokenChunker:
+    """Single-pass, token-aware text chunker.
+
+    Walks the text once from the front, keeping a running token count of
+    the stretch from the chunk start to the scan position; each step
+    counts only the characters it adds. Each chunk is the longest stretch
+    within ``chunk_size`` tokens, cut at the last separator of the
+    strongest kind in its second half (paragraph break, line break,
+    sentence end, space), and the next chunk starts ``chunk_overlap``
+    tokens before the cut, on a word boundary. Sizes follow
+    ``estimate_tokens``. Input may arrive in pieces, e.g. one per PDF page,
+    and chunks are yielded as soon as they are complete.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int = 0):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # Counts are in quarter tokens, less the 2 of a chunk's last word;
+        # a stretch never counts less than its length, so this many
+        # characters always hold a full chunk
+        self._budget = chunk_size * 4 - 2
+        self._overlap = chunk_overlap * 4 - 2
+        # Where to start looking for the overlap: average words just fit
+        self._window = self._overlap * 7 // 8
+
+    def split_text(self, text: str) -> list[str]:
+        return list(self.chunks([text]))
+
+    def chunks(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Yield chunks of the text formed by concatenating ``pieces``."""
+        text = ""
+        # The next chunk starts at ``start``; text from ``fresh`` on is in no
+        # chunk yet, and ``size`` is the count of text[start:fresh]
+        start = fresh = size = 0
+        for piece in pieces:
+            for blank in "\t\r\f\v":
+                if blank in piece:
+                    # _units only counts spaces and newlines as separators
+                    piece = piece.replace(blank, " ")
+            text += piece
+            while len(text) - start > self._budget:
+                chunk, start, fresh, size = self._next_chunk(text, start, fresh, size)
+                if chunk:
+                    yield chunk
+            if start > len(text) // 2:
+                # Drop consumed text so the buffer stays about a chunk long
+                text, fresh, start = text[start:], fresh - start, 0
+
+        while start < len(text):
+            chunk, start, fresh, size = self._next_chunk(text, start, fresh, size)
+            if chunk:
+                yield chunk
+
+    def _next_chunk(self, text: str, start: int, fresh: int, size: int):
+        """Cut one chunk starting at ``start``.
+
+        ``fresh`` is where text not yet in any chunk begins (the end of the
+        overlap), and ``size`` the count of the overlap; every chunk must
+        reach past it. Returns the chunk and the next ``start``, ``fresh``
+        and ``size``.
+        """
+        # Extend the limit by as many characters as there is room left,
+        # counting only what is added, until a few units short
+        limit, room = fresh, self._budget - size
+        while room > self._budget // 32 and limit < len(text):
+            end = min(limit + room, len(text))
+            room -= _units(text, limit, end)
+            limit = end
+        if room < 0:
+            # Every character counts at least one: backing up this far fits
+            limit += room
+        if limit >= len(text):
+            chunk = text[start:].strip() if text[fresh:].strip() else ""
+            return chunk, len(text), len(text), 0
+
+        # Prefer the strongest separator that keeps the chunk at least half
+        # full, so a paragraph break near the start doesn't leave a stub
+        cut = 0
+        for floor in (max(fresh, (start + limit) // 2), fresh):
+            for separator in SEPARATORS:
+                position = text.rfind(separator, floor + 1, limit)
+                if position > start:
+                    cut = position + len(separator)
+                    break
+            if cut:
+                break
+        if cut <= fresh:
+            cut = max(limit, fresh + 1)
+
+        # The overlap: whole words just before the cut, counted once
+        position = text.find(" ", max(start + 1, cut - self._window), cut) + 1
+        while 0 < position < cut:
+            size = _units(text, position, cut)
+            if size <= self._overlap:
+                return text[start:cut].strip(), position, cut, size
+            position = text.find(" ", position, cut) + 1
+        return text[start:cut].strip(), cut, cut, 0
@@ -1,40 +1,48 @@
-import os
+import time
 import uuid as uuid_module
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Awaitable, Callable, Iterator
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from pypdf import PdfReader
-from docx import Document as DocxDocument
 
 from app.db.models import Document, DocumentChunk
-from app.schemas import DocumentResponse, DocumentListResponse, DocumentStatusResponse
+from app.schemas import (
+    BulkResult,
+    DocumentResponse,
+    DocumentListResponse,
+    DocumentStatusResponse,
+)
+from app.providers import INGESTION, get_provider_registry
+from app.core.events import publish_document_event
+from app.core.metrics import INGESTION_STAGE_SECONDS
+from app.core.pagination import paginate
+from app.services.chunking import TokenChunker
+from app.services.files import discard_files
+from app.services.stats import SessionStatsService
+from app.services.versions import bump_documents_version
 from app.config import get_settings
 
 settings = get_settings()
 
 
 class DocumentService:
+    # Text extraction libraries are imported on first use so that constructing
+    # the service (once per upload request) stays cheap. The embeddings client
+    # is shared process-wide through the provider registry.
+
     def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.text_splitter = TokenChunker(
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
         )
-        self._embeddings = None
 
     @property
     def embeddings(self):
-        if self._embeddings is None:
-            self._embeddings = GoogleGenerativeAIEmbeddings(
-                model=settings.EMBEDDING_MODEL,
-                google_api_key=settings.GOOGLE_API_KEY,
-            )
-        return self._embeddings
+        return get_provider_registry().embeddings()
 
     async def save_uploaded_file(
         self,
@@ -72,95 +80,209 @@ class DocumentService:
             processing_status="pending",
         )
         db.add(document)
+        await SessionStatsService.adjust(db, session_id, document_count=1)
+        document.sync_version = await bump_documents_version(db, session_id)
         await db.commit()
         await db.refresh(document)
         return document
 
     async def process_document(self, db: AsyncSession, document_id: UUID) -> None:
-        """Process a document: extract text, chunk, and create embeddings."""
+        """Process a document: extract text, chunk, and create embeddings.
+
+        Time spent in each stage is stored on the document as
+        ``processing_metrics`` and exported as a Prometheus histogram. Status
+        changes and progress are published as document events.
+        """
         # Get document
         result = await db.execute(select(Document).where(Document.id == document_id))
         document = result.scalar_one_or_none()
         if not document:
             return
 
+        started = time.perf_counter()
+        stages: dict[str, float] = {}
+
+        def observe(name: str, elapsed: float) -> None:
+            stages[f"{name}_ms"] = round(elapsed * 1000, 1)
+            INGESTION_STAGE_SECONDS.labels(stage=name).observe(elapsed)
+
+        @contextmanager
+        def stage(name: str):
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                observe(name, time.perf_counter() - start)
+
+        extract_seconds = 0.0
+        characters = 0
+
+        def pages() -> Iterator[str]:
+            # Extraction is interleaved with splitting, so time it per piece
+            nonlocal extract_seconds, characters
+            pieces = self._iter_text(document.file_path, document.mime_type)
+            while True:
+                start = time.perf_counter()
+                piece = next(pieces, None)
+                extract_seconds += time.perf_counter() - start
+                if piece is None:
+                    return
+                characters += len(piece)
+                yield piece
+
+        def record(**counts) -> None:
+            document.processing_metrics = {
+                **stages,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                **counts,
+            }
+
+        # Read up front: a rollback expires the loaded attributes
+        event = {"session_id": document.session_id, "document_id": document.id}
+
+        async def publish(**progress) -> None:
+            await publish_document_event(
+                {
+                    **event,
+                    "processing_status": document.processing_status,
+                    "processing_error": document.processing_error,
+                    "chunk_count": document.chunk_count,
+                    **progress,
+                }
+            )
+
         try:
             # Update status to processing
             document.processing_status = "processing"
+            document.sync_version = await bump_documents_version(db, event["session_id"])
             await db.commit()
+            await publish(stage="extract")
 
-            # Extract text based on file type
-            text = self._extract_text(document.file_path, document.mime_type)
-
-            # Split into chunks
-            chunks = self.text_splitter.split_text(text)
+            # Extract text page by page and split it into chunks as it arrives
+            start = time.perf_counter()
+            chunks = list(self.text_splitter.chunks(pages()))
+            observe("extract", extract_seconds)
+            observe("split", time.perf_counter() - start - extract_seconds)
 
             if not chunks:
                 document.processing_status = "completed"
                 document.chunk_count = 0
+                record(characters=characters, chunks=0)
+                await SessionStatsService.adjust(
+                    db, event["session_id"], completed_document_count=1
+                )
+                document.sync_version = await bump_documents_version(db, event["session_id"])
                 await db.commit()
+                await publish()
                 return
 
             # Generate embeddings
-            embeddings = await self.embeddings.aembed_documents(chunks)
+            with stage("embed"):
+                embeddings = await self._embed_chunks(
+                    chunks,
+                    on_progress=lambda done: publish(
+                        stage="embed", embedded=done, chunks=len(chunks)
+                    ),
+                )
 
             # Store chunks with embeddings
-            for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    session_id=document.session_id,
-                    chunk_index=i,
-                    content=chunk_text,
-                    embedding=embedding,
-                    metadata={"source": document.original_filename, "chunk_index": i},
-                )
-                db.add(chunk)
+            await publish(stage="store", chunks=len(chunks))
+            with stage("store"):
+                for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
+                    chunk = DocumentChunk(
+                        document_id=document.id,
+                        session_id=document.session_id,
+                        chunk_index=i,
+                        content=chunk_text,
+                        embedding=embedding,
+                        chunk_metadata={"source": document.original_filename, "chunk_index": i},
+                    )
+                    db.add(chunk)
+                await db.flush()
 
             # Update document status
             document.processing_status = "completed"
             document.chunk_count = len(chunks)
+            record(characters=characters, chunks=len(chunks))
+            await SessionStatsService.adjust(
+                db, event["session_id"], completed_document_count=1, chunk_count=len(chunks)
+            )
+            document.sync_version = await bump_documents_version(db, event["session_id"])
             await db.commit()
+            await publish()
 
         except Exception as e:
+            await db.rollback()
             document.processing_status = "failed"
             document.processing_error = str(e)
+            record()
+            await SessionStatsService.adjust(db, event["session_id"], failed_document_count=1)
+            document.sync_version = await bump_documents_version(db, event["session_id"])
             await db.commit()
+            await publish()
             raise
 
-    def _extract_text(self, file_path: str, mime_type: str) -> str:
-        """Extract text from a file based on its type."""
+    async def _embed_chunks(
+        self,
+        chunks: list[str],
+        on_progress: Callable[[int], Awaitable[None]] | None = None,
+    ) -> list[list[float]]:
+        """Embed chunks in batches at ingestion priority.
+
+        ``on_progress`` is awaited with the number of chunks embedded so far
+        before each batch.
+        """
+        registry = get_provider_registry()
+        embeddings_client = self.embeddings
+        batch_size = settings.INGESTION_EMBED_BATCH_SIZE
+        embeddings = []
+        for start in range(0, len(chunks), batch_size):
+            if on_progress is not None:
+                await on_progress(start)
+            batch = chunks[start : start + batch_size]
+            async with registry.track(embeddings_client, priority=INGESTION, cost=len(batch)):
+                embeddings.extend(await embeddings_client.aembed_documents(batch))
+        return embeddings
+
+    def _iter_text(self, file_path: str, mime_type: str) -> Iterator[str]:
+        """Extract text from a file in pieces (pages, paragraphs or blocks)."""
         if mime_type == "application/pdf":
-            return self._extract_pdf_text(file_path)
+            return self._iter_pdf_text(file_path)
         elif mime_type in ["text/plain", "text/markdown"]:
-            return self._extract_plain_text(file_path)
+            return self._iter_plain_text(file_path)
         elif mime_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            return self._extract_docx_text(file_path)
+            return self._iter_docx_text(file_path)
         else:
             raise ValueError(f"Unsupported file type: {mime_type}")
 
-    def _extract_pdf_text(self, file_path: str) -> str:
-        """Extract text from a PDF file."""
+    @staticmethod
+    def _joined(parts: Iterator[str]) -> Iterator[str]:
+        """Yield non-empty parts separated by blank lines."""
+        separator = ""
+        for part in parts:
+            if part:
+                yield separator + part
+                separator = "\n\n"
+
+    def _iter_pdf_text(self, file_path: str) -> Iterator[str]:
+        """Extract text from a PDF file, one page at a time."""
+        from pypdf import PdfReader
+
         reader = PdfReader(file_path)
-        text_parts = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-        return "\n\n".join(text_parts)
-
-    def _extract_plain_text(self, file_path: str) -> str:
-        """Extract text from a plain text file."""
+        return self._joined(page.extract_text() for page in reader.pages)
+
+    def _iter_plain_text(self, file_path: str) -> Iterator[str]:
+        """Extract text from a plain text file in 64 KiB blocks."""
         with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+            while block := f.read(65536):
+                yield block
+
+    def _iter_docx_text(self, file_path: str) -> Iterator[str]:
+        """Extract text from a DOCX file, one paragraph at a time."""
+        from docx import Document as DocxDocument
 
-    def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from a DOCX file."""
         doc = DocxDocument(file_path)
-        text_parts = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text:
-                text_parts.append(paragraph.text)
-        return "\n\n".join(text_parts)
+        return self._joined(paragraph.text for paragraph in doc.paragraphs)
 
     @staticmethod
     async def get_document(db: AsyncSession, document_id: UUID) -> Document | None:
@@ -183,49 +305,108 @@ class DocumentService:
 
     @staticmethod
     async def list_documents(
-        db: AsyncSession, session_id: UUID, skip: int = 0, limit: int = 50
+        db: AsyncSession,
+        session_id: UUID,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> DocumentListResponse:
-        """List all documents for a session."""
+        """List documents for a session, newest first."""
         query = select(Document).where(Document.session_id == session_id)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Get paginated results
-        query = query.order_by(Document.created_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        documents = result.scalars().all()
+        # The maintained counter; paginate counts only if the session has none yet
+        total = None
+        if include_total:
+            total = await SessionStatsService.get_count(db, session_id, "document_count")
+        documents, next_cursor, total = await paginate(
+            db,
+            query,
+            [Document.created_at, Document.id],
+            descending=True,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            total=total,
+        )
 
         return DocumentListResponse(
             documents=[DocumentResponse.model_validate(d) for d in documents],
             total=total,
+            next_cursor=next_cursor,
         )
 
     @staticmethod
     async def delete_document(db: AsyncSession, document: Document) -> None:
         """Delete a document and its file."""
-        # Delete file
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
-
-        # Delete record (chunks will cascade)
+        # Chunks are removed by ON DELETE CASCADE, without loading them
         await db.delete(document)
+        completed = document.processing_status == "completed"
+        await SessionStatsService.adjust(
+            db,
+            document.session_id,
+            document_count=-1,
+            completed_document_count=-1 if completed else 0,
+            failed_document_count=-1 if document.processing_status == "failed" else 0,
+            chunk_count=-document.chunk_count if completed else 0,
+        )
+        await bump_documents_version(db, document.session_id, deletion=True)
         await db.commit()
+        discard_files([document.file_path])
 
     @staticmethod
-    async def get_document_status(
-        db: AsyncSession, document_id: UUID
-    ) -> DocumentStatusResponse | None:
-        """Get the processing status of a document."""
-        result = await db.execute(select(Document).where(Document.id == document_id))
-        document = result.scalar_one_or_none()
-        if not document:
-            return None
+    async def bulk_delete_documents(
+        db: AsyncSession, user_id: UUID, document_ids: list[UUID]
+    ) -> BulkResult:
+        """Delete many of a user's documents in one transaction.
+
+        A single DELETE both checks ownership and removes the rows (chunks
+        go by ON DELETE CASCADE); the files are removed after the commit.
+        """
+        result = await db.execute(
+            delete(Document)
+            .where(Document.id.in_(document_ids), Document.user_id == user_id)
+            .returning(
+                Document.id,
+                Document.session_id,
+                Document.file_path,
+                Document.processing_status,
+                Document.chunk_count,
+            )
+        )
+        rows = result.all()
+
+        deltas: dict[UUID, dict[str, int]] = defaultdict(
+            lambda: {
+                "document_count": 0,
+                "completed_document_count": 0,
+                "failed_document_count": 0,
+                "chunk_count": 0,
+            }
+        )
+        for row in rows:
+            delta = deltas[row.session_id]
+            delta["document_count"] -= 1
+            if row.processing_status == "completed":
+                delta["completed_document_count"] -= 1
+                delta["chunk_count"] -= row.chunk_count
+            elif row.processing_status == "failed":
+                delta["failed_document_count"] -= 1
+        # In a fixed order, so concurrent bulk deletes lock sessions alike
+        for session_id in sorted(deltas):
+            await SessionStatsService.adjust(db, session_id, **deltas[session_id])
+            await bump_documents_version(db, session_id, deletion=True)
+        await db.commit()
+        discard_files(row.file_path for row in rows)
+        return BulkResult.of(document_ids, [row.id for row in rows])
+
+    @staticmethod
+    def document_status(document: Document) -> DocumentStatusResponse:
+        """Processing status of an already loaded document."""
         return DocumentStatusResponse(
             id=document.id,
             processing_status=document.processing_status,
             processing_error=document.processing_error,
             chunk_count=document.chunk_count,
+            processing_metrics=document.processing_metrics,
         )
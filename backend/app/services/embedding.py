@@ -1,10 +1,14 @@
+import asyncio
 from uuid import UUID
 from dataclasses import dataclass
+from typing import Awaitable, Callable
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
+from app.providers import get_provider_registry
+from app.core.metrics import EMBEDDING_BATCH_SIZE
+from app.services.stats import SessionStatsService
 from app.config import get_settings
 
 settings = get_settings()
@@ -21,18 +25,102 @@ class RetrievedChunk:
     metadata: dict
 
 
+class QueryEmbeddingBatcher:
+    """Coalesces concurrent query embeddings into batched provider calls.
+
+    Requests are collected for up to ``window_seconds`` after the first one
+    arrives, or until ``max_batch_size`` distinct texts are waiting, and are
+    then embedded with a single call. Each caller gets its own vector back;
+    identical texts in a batch share one slot.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[list[str]], Awaitable[list[list[float]]]],
+        window_seconds: float,
+        max_batch_size: int,
+    ):
+        self._embed_batch = embed_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        texts = list(batch)
+        EMBEDDING_BATCH_SIZE.observe(len(texts))
+        try:
+            vectors = await self._embed_batch(texts)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for text, vector in zip(texts, vectors):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(vector)
+
+
+def _embed_query_batch(embeddings, texts: list[str]) -> list[list[float]]:
+    """Embed several search queries with one provider request."""
+    if "task_type" in getattr(type(embeddings), "model_fields", {}):
+        # Google embeddings: batch endpoint with the query task type, matching embed_query
+        return embeddings.embed_documents(texts, task_type="retrieval_query")
+    return [embeddings.embed_query(t) for t in texts]
+
+
 class EmbeddingService:
     def __init__(self):
-        self._embeddings = None
+        self._query_batcher = None
+        if settings.EMBEDDING_BATCH_WINDOW_MS > 0:
+            self._query_batcher = QueryEmbeddingBatcher(
+                self._embed_queries,
+                window_seconds=settings.EMBEDDING_BATCH_WINDOW_MS / 1000,
+                max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            )
 
     @property
     def embeddings(self):
-        if self._embeddings is None:
-            self._embeddings = GoogleGenerativeAIEmbeddings(
-                model=settings.EMBEDDING_MODEL,
-                google_api_key=settings.GOOGLE_API_KEY,
-            )
-        return self._embeddings
+        return get_provider_registry().embeddings()
+
+    async def _embed_queries(self, texts: list[str]) -> list[list[float]]:
+        embeddings = self.embeddings
+        async with get_provider_registry().track(embeddings, cost=len(texts)):
+            if len(texts) == 1:
+                return [await embeddings.aembed_query(texts[0])]
+            return await asyncio.to_thread(_embed_query_batch, embeddings, texts)
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a search query, batched with concurrent queries when enabled."""
+        if self._query_batcher is None:
+            return (await self._embed_queries([query]))[0]
+        return await self._query_batcher.embed(query)
 
     async def similarity_search(
         self,
@@ -44,7 +132,7 @@ class EmbeddingService:
     ) -> list[RetrievedChunk]:
         """Perform similarity search using pgvector."""
         # Generate query embedding
-        query_embedding = await self.embeddings.aembed_query(query)
+        query_embedding = await self.embed_query(query)
 
         # Convert embedding to string format for pgvector
         embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
@@ -56,16 +144,16 @@ class EmbeddingService:
                 SELECT
                     dc.id,
                     dc.content,
-                    dc.metadata,
+                    dc.chunk_metadata,
                     dc.chunk_index,
                     dc.document_id,
                     d.original_filename,
-                    1 - (dc.embedding <=> :query_embedding::vector) as similarity
+                    1 - (dc.embedding <=> CAST(:query_embedding AS vector)) as similarity
                 FROM document_chunks dc
                 JOIN documents d ON dc.document_id = d.id
                 WHERE dc.session_id = :session_id
                     AND dc.embedding IS NOT NULL
-                ORDER BY dc.embedding <=> :query_embedding::vector
+                ORDER BY dc.embedding <=> CAST(:query_embedding AS vector)
                 LIMIT :k
             """),
             {
@@ -88,7 +176,7 @@ class EmbeddingService:
                         document_name=row.original_filename,
                         chunk_index=row.chunk_index,
                         similarity=row.similarity,
-                        metadata=row.metadata or {},
+                        metadata=row.chunk_metadata or {},
                     )
                 )
 
@@ -96,6 +184,10 @@ class EmbeddingService:
 
     async def has_documents(self, db: AsyncSession, session_id: UUID) -> bool:
         """Check if a session has any document chunks."""
+        chunk_count = await SessionStatsService.get_count(db, session_id, "chunk_count")
+        if chunk_count is not None:
+            return chunk_count > 0
+        # No statistics row yet (a session from before they existed)
         result = await db.execute(
             text("""
                 SELECT EXISTS(
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import select
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import Document
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Filenames checked against the documents table per query
+_LOOKUP_BATCH = 1000
+# Removal tasks in flight; held so they are not garbage collected mid-way
+_pending: set[asyncio.Task] = set()
+
+
+def _unlink(paths: list[str]) -> int:
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning("Could not remove %s", path, exc_info=True)
+    return removed
+
+
+def discard_files(paths: Iterable[str]) -> None:
+    """Remove uploaded files in the background.
+
+    Call after the deletion of the rows referencing them is committed, so
+    a rolled back delete never loses its file. Removal runs in a worker
+    thread; whatever is missed (e.g. the process exits first) is left for
+    ``collect_orphaned_files``.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    task = asyncio.get_running_loop().create_task(asyncio.to_thread(_unlink, paths))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def wait_for_discards() -> None:
+    """Wait for background removals still running; used at shutdown."""
+    if _pending:
+        await asyncio.gather(*_pending, return_exceptions=True)
+
+
+def _stale_uploads(upload_dir: Path, older_than: float) -> dict[str, str]:
+    if not upload_dir.is_dir():
+        return {}
+    stale = {}
+    with os.scandir(upload_dir) as entries:
+        for entry in entries:
+            # Uploads are named by uuid; dotfiles (.gitkeep) are never ours
+            if entry.name.startswith("."):
+                continue
+            if entry.is_file() and entry.stat().st_mtime < older_than:
+                stale[entry.name] = entry.path
+    return stale
+
+
+async def collect_orphaned_files(grace_seconds: float) -> int:
+    """Remove files in UPLOAD_DIR that no document references.
+
+    Files younger than ``grace_seconds`` are kept: an upload writes its file
+    before the document row is committed. Returns the number removed.
+    """
+    stale = await asyncio.to_thread(
+        _stale_uploads, Path(settings.UPLOAD_DIR), time.time() - grace_seconds
+    )
+    names = list(stale)
+    orphans = []
+    async with AsyncSessionLocal() as db:
+        for i in range(0, len(names), _LOOKUP_BATCH):
+            batch = names[i : i + _LOOKUP_BATCH]
+            result = await db.execute(select(Document.filename).where(Document.filename.in_(batch)))
+            referenced = set(result.scalars().all())
+            orphans.extend(stale[name] for name in batch if name not in referenced)
+    return await asyncio.to_thread(_unlink, orphans)
+
+
+async def run_file_gc(interval_seconds: float, grace_seconds: float) -> None:
+    """Collect orphaned uploads forever at a fixed interval; cancel the task to stop."""
+    while True:
+        try:
+            removed = await collect_orphaned_files(grace_seconds)
+            if removed:
+                logger.info("Removed %d orphaned upload files", removed)
+        except Exception:
+            logger.exception("Upload garbage collection failed")
+        await asyncio.sleep(interval_seconds)
@@ -1,10 +1,14 @@
+from collections import Counter
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import paginate
 from app.db.models import Note
-from app.schemas import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from app.schemas import BulkResult, NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from app.services.stats import SessionStatsService
+from app.services.versions import bump_notes_version
 
 
 class NoteService:
@@ -20,6 +24,8 @@ class NoteService:
             content=note_data.content,
         )
         db.add(note)
+        await SessionStatsService.adjust(db, session_id, note_count=1)
+        await bump_notes_version(db, session_id)
         await db.commit()
         await db.refresh(note)
         return note
@@ -42,28 +48,35 @@ class NoteService:
 
     @staticmethod
     async def list_notes(
-        db: AsyncSession, session_id: UUID, skip: int = 0, limit: int = 50
+        db: AsyncSession,
+        session_id: UUID,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> NoteListResponse:
-        """List all notes for a session."""
+        """List notes for a session, pinned first, then newest first."""
         query = select(Note).where(Note.session_id == session_id)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Get paginated results (pinned first, then by creation date)
-        query = (
-            query.order_by(Note.is_pinned.desc(), Note.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        # The maintained counter; paginate counts only if the session has none yet
+        total = None
+        if include_total:
+            total = await SessionStatsService.get_count(db, session_id, "note_count")
+        notes, next_cursor, total = await paginate(
+            db,
+            query,
+            [Note.is_pinned, Note.created_at, Note.id],
+            descending=True,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            total=total,
         )
-        result = await db.execute(query)
-        notes = result.scalars().all()
 
         return NoteListResponse(
             notes=[NoteResponse.model_validate(n) for n in notes],
             total=total,
+            next_cursor=next_cursor,
         )
 
     @staticmethod
@@ -72,6 +85,7 @@ class NoteService:
         update_data = note_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(note, field, value)
+        await bump_notes_version(db, note.session_id)
         await db.commit()
         await db.refresh(note)
         return note
@@ -80,12 +94,51 @@ class NoteService:
     async def delete_note(db: AsyncSession, note: Note) -> None:
         """Delete a note."""
         await db.delete(note)
+        await SessionStatsService.adjust(db, note.session_id, note_count=-1)
+        await bump_notes_version(db, note.session_id)
         await db.commit()
 
     @staticmethod
     async def pin_note(db: AsyncSession, note: Note, pin: bool = True) -> Note:
         """Pin or unpin a note."""
         note.is_pinned = pin
+        await bump_notes_version(db, note.session_id)
         await db.commit()
         await db.refresh(note)
         return note
+
+    @staticmethod
+    async def bulk_delete_notes(
+        db: AsyncSession, user_id: UUID, note_ids: list[UUID]
+    ) -> BulkResult:
+        """Delete many of a user's notes with one statement and one commit."""
+        result = await db.execute(
+            delete(Note)
+            .where(Note.id.in_(note_ids), Note.user_id == user_id)
+            .returning(Note.id, Note.session_id)
+        )
+        rows = result.all()
+        per_session = Counter(row.session_id for row in rows)
+        # In a fixed order, so concurrent bulk writes lock sessions alike
+        for session_id in sorted(per_session):
+            await SessionStatsService.adjust(db, session_id, note_count=-per_session[session_id])
+            await bump_notes_version(db, session_id)
+        await db.commit()
+        return BulkResult.of(note_ids, [row.id for row in rows])
+
+    @staticmethod
+    async def bulk_pin_notes(
+        db: AsyncSession, user_id: UUID, note_ids: list[UUID], pin: bool = True
+    ) -> BulkResult:
+        """Pin or unpin many of a user's notes with one statement and one commit."""
+        result = await db.execute(
+            update(Note)
+            .where(Note.id.in_(note_ids), Note.user_id == user_id)
+            .values(is_pinned=pin)
+            .returning(Note.id, Note.session_id)
+        )
+        rows = result.all()
+        for session_id in sorted({row.session_id for row in rows}):
+            await bump_notes_version(db, session_id)
+        await db.commit()
+        return BulkResult.of(note_ids, [row.id for row in rows])
@@ -1,10 +1,25 @@
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import func, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import StudySession
-from app.schemas import SessionCreate, SessionUpdate, SessionResponse, SessionListResponse
+from app.core.auth_cache import get_auth_cache
+from app.core.pagination import paginate
+from app.db.models import ChatMessage, Document, Note, SessionStatistics, StudySession
+from app.schemas import (
+    BulkResult,
+    SessionCreate,
+    SessionUpdate,
+    SessionResponse,
+    SessionListResponse,
+    SessionStats,
+    SessionSummary,
+    SessionDashboardResponse,
+)
+from app.graph.checkpoint import delete_thread
+from app.services.files import discard_files
+from app.services.stats import SessionStatsService
+from app.services.versions import bump_sessions_version
 
 
 class SessionService:
@@ -20,6 +35,10 @@ class SessionService:
             subject=session_data.subject,
         )
         db.add(session)
+        # The statistics row references the session, so insert that first
+        await db.flush()
+        await SessionStatsService.create(db, session.id)
+        await bump_sessions_version(db, user_id)
         await db.commit()
         await db.refresh(session)
         return session
@@ -45,6 +64,17 @@ class SessionService:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def is_session_owner(db: AsyncSession, session_id: UUID, user_id: UUID) -> bool:
+        """Whether a session exists and belongs to the user, without loading it."""
+        result = await db.execute(
+            select(StudySession.id).where(
+                StudySession.id == session_id,
+                StudySession.user_id == user_id,
+            )
+        )
+        return result.first() is not None
+
     @staticmethod
     async def list_sessions(
         db: AsyncSession,
@@ -52,27 +82,161 @@ class SessionService:
         skip: int = 0,
         limit: int = 20,
         include_archived: bool = False,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> SessionListResponse:
-        """List all sessions for a user."""
+        """List sessions for a user, newest first."""
         query = select(StudySession).where(StudySession.user_id == user_id)
 
         if not include_archived:
             query = query.where(StudySession.is_archived == False)
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Get paginated results
-        query = query.order_by(StudySession.created_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(query)
-        sessions = result.scalars().all()
+        sessions, next_cursor, total = await paginate(
+            db,
+            query,
+            [StudySession.created_at, StudySession.id],
+            descending=True,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+        )
 
         return SessionListResponse(
             sessions=[SessionResponse.model_validate(s) for s in sessions],
             total=total,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    async def list_dashboard(
+        db: AsyncSession,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 20,
+        include_archived: bool = False,
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> SessionDashboardResponse:
+        """List sessions for a user, newest first, with per-session aggregates.
+
+        One statement for the whole page. Counts come from the maintained
+        ``session_stats`` rows; only sessions without one (until the repair
+        job creates it) are counted, by LATERAL subqueries that are skipped
+        for every other row. The last message time is an index seek.
+        """
+        base = select(StudySession).where(StudySession.user_id == user_id)
+        if not include_archived:
+            base = base.where(StudySession.is_archived == False)
+
+        stats = SessionStatistics
+        missing = stats.session_id.is_(None)
+        status = Document.processing_status
+        documents = (
+            select(
+                func.count().label("document_count"),
+                func.count().filter(status == "completed").label("completed_document_count"),
+                func.count()
+                .filter(status.in_(("pending", "processing")))
+                .label("processing_document_count"),
+                func.count().filter(status == "failed").label("failed_document_count"),
+            )
+            .where(Document.session_id == StudySession.id, missing)
+            .lateral("document_counts")
+        )
+        notes = (
+            select(func.count().label("note_count"))
+            .where(Note.session_id == StudySession.id, missing)
+            .lateral("note_counts")
+        )
+        messages = (
+            select(func.count().label("message_count"))
+            .where(ChatMessage.session_id == StudySession.id, missing)
+            .lateral("message_counts")
+        )
+        last_message = (
+            select(ChatMessage.created_at.label("last_message_at"))
+            .where(ChatMessage.session_id == StudySession.id)
+            .order_by(ChatMessage.created_at.desc())
+            .limit(1)
+            .lateral("last_message")
+        )
+        counts = [
+            func.coalesce(stats.document_count, documents.c.document_count).label("document_count"),
+            func.coalesce(
+                stats.completed_document_count, documents.c.completed_document_count
+            ).label("completed_document_count"),
+            # Pending uploads count as processing, as in the fallback
+            func.coalesce(
+                stats.document_count - stats.completed_document_count - stats.failed_document_count,
+                documents.c.processing_document_count,
+            ).label("processing_document_count"),
+            func.coalesce(
+                stats.failed_document_count, documents.c.failed_document_count
+            ).label("failed_document_count"),
+            func.coalesce(stats.note_count, notes.c.note_count).label("note_count"),
+            func.coalesce(stats.message_count, messages.c.message_count).label("message_count"),
+            last_message.c.last_message_at,
+        ]
+        query = (
+            base.add_columns(*counts)
+            .select_from(StudySession)
+            .outerjoin(stats, stats.session_id == StudySession.id)
+            .outerjoin(documents, true())
+            .outerjoin(notes, true())
+            .outerjoin(messages, true())
+            .outerjoin(last_message, true())
+        )
+
+        rows, next_cursor, total = await paginate(
+            db,
+            query,
+            [StudySession.created_at, StudySession.id],
+            descending=True,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            count_query=base,
+        )
+
+        return SessionDashboardResponse(
+            sessions=[
+                SessionSummary(
+                    **SessionResponse.model_validate(row.StudySession).model_dump(),
+                    stats=SessionStats.model_validate(row._mapping),
+                )
+                for row in rows
+            ],
+            total=total,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    async def dashboard_version(db: AsyncSession, user_id: UUID) -> tuple[int, int]:
+        """Version counters behind the ETag of a user's dashboard.
+
+        Totals over all the user's sessions of the counters every content
+        change bumps, and of their statistics rows' content versions (which
+        repairs bump too). Both only grow, so any change moves a total.
+        """
+        result = await db.execute(
+            select(
+                func.coalesce(
+                    func.sum(
+                        StudySession.documents_version
+                        + StudySession.notes_version
+                        + StudySession.sync_version
+                    ),
+                    0,
+                ),
+                func.coalesce(func.sum(SessionStatistics.content_version), 0),
+            )
+            .select_from(StudySession)
+            .outerjoin(SessionStatistics, SessionStatistics.session_id == StudySession.id)
+            .where(StudySession.user_id == user_id)
         )
+        return tuple(result.one())
 
     @staticmethod
     async def update_session(
@@ -82,15 +246,29 @@ class SessionService:
         update_data = session_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(session, field, value)
+        await bump_sessions_version(db, session.user_id)
         await db.commit()
         await db.refresh(session)
         return session
 
     @staticmethod
     async def delete_session(db: AsyncSession, session: StudySession) -> None:
-        """Delete a session."""
+        """Delete a session with everything in it.
+
+        Documents, chunks, messages and notes are removed by ON DELETE
+        CASCADE rather than loaded; only the file paths are read, so the
+        files can be removed once the delete is committed.
+        """
+        result = await db.execute(
+            select(Document.file_path).where(Document.session_id == session.id)
+        )
+        file_paths = result.scalars().all()
         await db.delete(session)
+        await bump_sessions_version(db, session.user_id)
         await db.commit()
+        get_auth_cache().forget_session(session.id)
+        discard_files(file_paths)
+        await delete_thread(session.id)
 
     @staticmethod
     async def archive_session(
@@ -98,6 +276,24 @@ class SessionService:
     ) -> StudySession:
         """Archive or unarchive a session."""
         session.is_archived = archive
+        await bump_sessions_version(db, session.user_id)
         await db.commit()
         await db.refresh(session)
         return session
+
+    @staticmethod
+    async def bulk_archive_sessions(
+        db: AsyncSession, user_id: UUID, session_ids: list[UUID], archive: bool = True
+    ) -> BulkResult:
+        """Archive or unarchive many of a user's sessions with one statement and one commit."""
+        result = await db.execute(
+            update(StudySession)
+            .where(StudySession.id.in_(session_ids), StudySession.user_id == user_id)
+            .values(is_archived=archive)
+            .returning(StudySession.id)
+        )
+        archived = list(result.scalars().all())
+        if archived:
+            await bump_sessions_version(db, user_id)
+        await db.commit()
+        return BulkResult.of(session_ids, archived)
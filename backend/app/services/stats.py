@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import SessionStatistics, StudySession
+
+logger = logging.getLogger(__name__)
+
+# Per-session counts recomputed from the child tables
+_COUNTS = """
+    SELECT
+        ss.id AS session_id,
+        (SELECT count(*) FROM document_chunks c
+         WHERE c.session_id = ss.id AND c.embedding IS NOT NULL) AS chunk_count,
+        (SELECT count(*) FROM documents d WHERE d.session_id = ss.id) AS document_count,
+        (SELECT count(*) FROM documents d
+         WHERE d.session_id = ss.id AND d.processing_status = 'completed')
+            AS completed_document_count,
+        (SELECT count(*) FROM documents d
+         WHERE d.session_id = ss.id AND d.processing_status = 'failed')
+            AS failed_document_count,
+        (SELECT count(*) FROM chat_messages m WHERE m.session_id = ss.id) AS message_count,
+        (SELECT count(*) FROM notes n WHERE n.session_id = ss.id) AS note_count
+    FROM study_sessions ss
+    WHERE ss.id = ANY(:ids)
+"""
+
+# Correct existing rows; rows that already match are left alone, so a clean
+# run writes nothing
+_RECOUNT = text(f"""
+    UPDATE session_stats AS s SET
+        chunk_count = c.chunk_count,
+        document_count = c.document_count,
+        completed_document_count = c.completed_document_count,
+        failed_document_count = c.failed_document_count,
+        message_count = c.message_count,
+        note_count = c.note_count,
+        content_version = s.content_version + 1
+    FROM ({_COUNTS}) AS c
+    WHERE s.session_id = c.session_id
+      AND (s.chunk_count, s.document_count, s.completed_document_count,
+           s.failed_document_count, s.message_count, s.note_count)
+        IS DISTINCT FROM
+          (c.chunk_count, c.document_count, c.completed_document_count,
+           c.failed_document_count, c.message_count, c.note_count)
+    RETURNING s.session_id
+""")
+
+# Create the missing rows (sessions from before the table existed)
+_CREATE_MISSING = text(f"""
+    INSERT INTO session_stats (
+        session_id, chunk_count, document_count, completed_document_count,
+        failed_document_count, message_count, note_count, content_version
+    )
+    SELECT c.*, 1 FROM ({_COUNTS}) AS c
+    ON CONFLICT (session_id) DO NOTHING
+    RETURNING session_id
+""")
+
+
+class SessionStatsService:
+    @staticmethod
+    async def get_count(db: AsyncSession, session_id: UUID, counter: str) -> int | None:
+        """One counter of a session, or None if its statistics row is missing."""
+        column = getattr(SessionStatistics, counter)
+        result = await db.execute(
+            select(column).where(SessionStatistics.session_id == session_id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def create(db: AsyncSession, session_id: UUID) -> None:
+        """Create the all-zero statistics row of a new, already flushed session."""
+        await db.execute(insert(SessionStatistics).values(session_id=session_id, content_version=1))
+
+    @staticmethod
+    async def adjust(db: AsyncSession, session_id: UUID, **deltas: int) -> None:
+        """Add ``deltas`` to a session's counters in the caller's transaction.
+
+        The row stays locked until the caller commits, which is what lets
+        ``repair`` recount without losing concurrent adjustments. A session
+        without a row is left without one (readers fall back to counting)
+        until ``repair`` creates it. Before giving up, the session itself is
+        key-share locked: that waits out a repair creating the row right now,
+        and keeps one from starting before this transaction commits.
+        """
+        columns = SessionStatistics.__table__.c
+        statement = (
+            update(SessionStatistics)
+            .where(columns.session_id == session_id)
+            .values(
+                **{name: columns[name] + delta for name, delta in deltas.items()},
+                content_version=columns.content_version + 1,
+            )
+        )
+        if (await db.execute(statement)).rowcount:
+            return
+        await db.execute(
+            select(StudySession.id)
+            .where(StudySession.id == session_id)
+            .with_for_update(key_share=True)
+        )
+        # A new statement, so it sees a row the repair just committed
+        await db.execute(statement)
+
+    @staticmethod
+    async def repair(batch_size: int = 500) -> int:
+        """Recount every session's statistics, fixing drifted rows and creating missing ones.
+
+        Walks the sessions in id order, one transaction per batch, and never
+        waits on a lock: anything a writer is busy with is skipped until the
+        next run. Existing rows are locked first, so writers that reach them
+        later add their deltas on top of the recount. Missing rows are
+        created only for sessions locked outright; writers touching a
+        session (inserting content, bumping a version or in ``adjust``) hold
+        at least a key-share lock on it, so none can be half done. Returns
+        the number of rows created or corrected.
+        """
+        repaired, after = 0, None
+        async with AsyncSessionLocal() as db:
+            while True:
+                query = select(StudySession.id).order_by(StudySession.id).limit(batch_size)
+                if after is not None:
+                    query = query.where(StudySession.id > after)
+                ids = list((await db.execute(query)).scalars().all())
+                if not ids:
+                    break
+                after = ids[-1]
+
+                existing = (
+                    await db.execute(
+                        select(SessionStatistics.session_id)
+                        .where(SessionStatistics.session_id.in_(ids))
+                        .order_by(SessionStatistics.session_id)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).scalars().all()
+                if existing:
+                    result = await db.execute(_RECOUNT, {"ids": list(existing)})
+                    repaired += len(result.all())
+
+                missing = (
+                    await db.execute(
+                        select(StudySession.id)
+                        .where(
+                            StudySession.id.in_(ids),
+                            ~select(SessionStatistics.session_id)
+                            .where(SessionStatistics.session_id == StudySession.id)
+                            .exists(),
+                        )
+                        .order_by(StudySession.id)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).scalars().all()
+                if missing:
+                    result = await db.execute(_CREATE_MISSING, {"ids": list(missing)})
+                    repaired += len(result.all())
+                await db.commit()
+        return repaired
+
+
+async def run_session_stats_repair(interval_seconds: float) -> None:
+    """Repair session statistics forever at a fixed interval; cancel the task to stop."""
+    while True:
+        try:
+            repaired = await SessionStatsService.repair()
+            if repaired:
+                logger.info("Repaired statistics of %d sessions", repaired)
+        except Exception:
+            logger.exception("Session statistics repair failed")
+        await asyncio.sleep(interval_seconds)
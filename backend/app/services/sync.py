@@ -0,0 +1,81 @@
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.models import ChatMessage, Document, StudySession
+from app.schemas import DocumentResponse, SessionChangesResponse
+from app.services.chat import ChatService
+
+# Sorts after every message id: a cursor past all messages of its version
+_AFTER_ALL = UUID(int=(1 << 128) - 1)
+
+
+class SyncService:
+    @staticmethod
+    async def get_changes(
+        db: AsyncSession, session_id: UUID, since: str | None = None, limit: int = 200
+    ) -> SessionChangesResponse:
+        """Messages and documents of a session written since a cursor.
+
+        Every change takes the session's next sync_version while holding the
+        session row until it commits (see bump_sync_version), so once a
+        version is visible, so are all the versions below it. Cursors are a
+        (sync_version, message id) keyset over that order and a sync costs
+        O(changes). Deletions cannot be sent as a delta: a cursor from
+        before the last one gets a full load instead, flagged ``full``.
+        Without ``since`` this is a full load too: the latest ``limit``
+        messages and every document.
+        """
+        # Read before the rows, so everything up to this version is among them
+        result = await db.execute(
+            select(StudySession.sync_version, StudySession.sync_reset_version).where(
+                StudySession.id == session_id
+            )
+        )
+        sync_version, reset_version = result.one()
+
+        messages_query = select(ChatMessage).where(ChatMessage.session_id == session_id)
+        documents_query = select(Document).where(Document.session_id == session_id)
+        after = None
+        if since is not None:
+            after = decode_cursor(since, [ChatMessage.sync_version, ChatMessage.id])
+            if after[0] < reset_version:
+                after = None
+
+        cursor = [sync_version, _AFTER_ALL]
+        has_more = False
+        if after is None:
+            result = await db.execute(
+                messages_query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                .limit(limit)
+            )
+            messages = list(reversed(result.scalars().all()))
+        else:
+            result = await db.execute(
+                messages_query.where(
+                    tuple_(ChatMessage.sync_version, ChatMessage.id) > tuple_(*after)
+                )
+                .order_by(ChatMessage.sync_version.asc(), ChatMessage.id.asc())
+                .limit(limit + 1)
+            )
+            messages = list(result.scalars().all())
+            has_more = len(messages) > limit
+            if has_more:
+                messages = messages[:limit]
+                cursor = [messages[-1].sync_version, messages[-1].id]
+            # Conversation order; a chat turn's two messages share one version
+            messages.sort(key=lambda m: (m.created_at, m.id))
+            documents_query = documents_query.where(Document.sync_version > after[0])
+
+        result = await db.execute(documents_query.order_by(Document.created_at.desc()))
+        documents = result.scalars().all()
+
+        return SessionChangesResponse(
+            messages=[ChatService.message_response(m) for m in messages],
+            documents=[DocumentResponse.model_validate(d) for d in documents],
+            cursor=encode_cursor(cursor),
+            has_more=has_more,
+            full=after is None,
+        )
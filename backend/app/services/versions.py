@@ -0,0 +1,71 @@
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import StudySession, User
+
+# Version counters behind the ETags of list endpoints and the session delta
+# sync. Writers bump them in the same transaction as the change, so a
+# version never runs ahead of the rows it describes. updated_at is kept as is: a counter bump is not an edit
+# of the parent row.
+
+
+async def bump_sessions_version(db: AsyncSession, user_id: UUID) -> None:
+    """Invalidate the user's session list and session details."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(sessions_version=User.sessions_version + 1, updated_at=User.updated_at)
+    )
+
+
+def _next_sync_version(deletion: bool) -> dict:
+    values = {"sync_version": StudySession.sync_version + 1}
+    if deletion:
+        values["sync_reset_version"] = StudySession.sync_version + 1
+    return values
+
+
+async def bump_documents_version(
+    db: AsyncSession, session_id: UUID, *, deletion: bool = False
+) -> int:
+    """Invalidate the session's document list; returns the change's sync version."""
+    result = await db.execute(
+        update(StudySession)
+        .where(StudySession.id == session_id)
+        .values(
+            documents_version=StudySession.documents_version + 1,
+            updated_at=StudySession.updated_at,
+            **_next_sync_version(deletion),
+        )
+        .returning(StudySession.sync_version)
+    )
+    return result.scalar_one()
+
+
+async def bump_sync_version(db: AsyncSession, session_id: UUID, *, deletion: bool = False) -> int:
+    """Take the session's next sync version for a change to its messages.
+
+    The session row stays locked until the caller commits, so a session's
+    sync versions become visible in order (see SyncService).
+    """
+    result = await db.execute(
+        update(StudySession)
+        .where(StudySession.id == session_id)
+        .values(updated_at=StudySession.updated_at, **_next_sync_version(deletion))
+        .returning(StudySession.sync_version)
+    )
+    return result.scalar_one()
+
+
+async def bump_notes_version(db: AsyncSession, session_id: UUID) -> None:
+    """Invalidate the session's note list."""
+    await db.execute(
+        update(StudySession)
+        .where(StudySession.id == session_id)
+        .values(
+            notes_version=StudySession.notes_version + 1,
+            updated_at=StudySession.updated_at,
+        )
+    )
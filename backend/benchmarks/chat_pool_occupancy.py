@@ -0,0 +1,149 @@
+"""Connection pool occupancy under concurrent chat turns.
+
+Runs batches of concurrent chat turns through ChatService.process_message,
+the way the chat endpoint does (one request session that first runs the
+ownership check), and samples how many pooled connections are checked out.
+The LLM and embedding providers are the offline fake provider with a fixed
+LLM latency, so the run measures our own connection handling rather than the
+provider. With connections released during generation, occupancy should stay
+flat as concurrency rises instead of climbing to the pool limit.
+
+Requires a Postgres with pgvector at DATABASE_URL. A throwaway user, session
+and document are created and removed again.
+
+Usage (from ``backend/``):
+
+    python -m benchmarks.chat_pool_occupancy --concurrency 1 5 10 20 40 --llm-latency 2 --ramp 1
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from app.config import get_settings
+from app.db.database import AsyncSessionLocal, engine, init_db
+from app.db.models import Document, DocumentChunk, StudySession, User
+from app.providers import get_provider_registry
+from app.services.chat import ChatService
+from app.services.session import SessionService
+
+settings = get_settings()
+
+
+async def seed(embeddings) -> tuple[uuid.UUID, uuid.UUID]:
+    """Create a user with one session holding one embedded document."""
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        session = StudySession(user_id=user.id, title="Pool occupancy benchmark")
+        db.add(session)
+        await db.flush()
+        document = Document(
+            session_id=session.id,
+            user_id=user.id,
+            filename="bench.txt",
+            original_filename="bench.txt",
+            file_path="/dev/null",
+            file_size=0,
+            mime_type="text/plain",
+            processing_status="completed",
+            chunk_count=20,
+        )
+        db.add(document)
+        await db.flush()
+        texts = [f"Benchmark chunk {i} about topic {i % 5}" for i in range(20)]
+        for i, (text, vector) in enumerate(zip(texts, embeddings.embed_documents(texts))):
+            db.add(
+                DocumentChunk(
+                    document_id=document.id,
+                    session_id=session.id,
+                    chunk_index=i,
+                    content=text,
+                    embedding=vector,
+                )
+            )
+        await db.commit()
+        return user.id, session.id
+
+
+async def cleanup(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+        if user is not None:
+            await db.delete(user)
+            await db.commit()
+
+
+async def chat_request(user_id: uuid.UUID, session_id: uuid.UUID, n: int, delay: float) -> None:
+    """One chat request: ownership check then the chat turn on the same session."""
+    await asyncio.sleep(delay)
+    async with AsyncSessionLocal() as db:
+        await SessionService.get_session_for_user(db, session_id, user_id)
+        await ChatService.process_message(
+            db=db, session_id=session_id, user_id=user_id, content=f"What is topic {n % 5}?"
+        )
+
+
+async def run_level(user_id, session_id, concurrency: int, ramp: float) -> dict:
+    samples: list[int] = []
+    stop = asyncio.Event()
+
+    async def sampler():
+        while not stop.is_set():
+            samples.append(engine.pool.checkedout())
+            await asyncio.sleep(0.005)
+
+    sampling = asyncio.create_task(sampler())
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[
+            chat_request(user_id, session_id, i, ramp * i / concurrency)
+            for i in range(concurrency)
+        ],
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampling
+
+    return {
+        "concurrency": concurrency,
+        "errors": sum(isinstance(r, Exception) for r in results),
+        "seconds": elapsed,
+        "max_checked_out": max(samples),
+        "mean_checked_out": statistics.mean(samples),
+    }
+
+
+async def main(args) -> None:
+    settings.LLM_PROVIDER = "fake"
+    settings.FAKE_LLM_LATENCY_SECONDS = args.llm_latency
+    settings.FAKE_LLM_TOKENS_PER_SECOND = 0
+    embeddings = get_provider_registry().embeddings()
+
+    await init_db()
+    user_id, session_id = await seed(embeddings)
+    try:
+        print(f"pool size={engine.pool.size()} overflow={engine.pool._max_overflow}, "
+              f"LLM latency {args.llm_latency}s per call")
+        print(f"{'concurrency':>11} {'seconds':>8} {'errors':>6} {'max conns':>9} {'mean conns':>10}")
+        for level in args.concurrency:
+            r = await run_level(user_id, session_id, level, args.ramp)
+            print(f"{r['concurrency']:>11} {r['seconds']:>8.2f} {r['errors']:>6} "
+                  f"{r['max_checked_out']:>9} {r['mean_checked_out']:>10.2f}")
+    finally:
+        await cleanup(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 20, 40])
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    parser.add_argument(
+        "--ramp", type=float, default=1.0, help="seconds over which request starts are spread"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""Chunking speed and chunk-size spread: token chunker vs character splitter.
+
+Splits generated lecture-like documents of several sizes with the
+``TokenChunker`` used for ingestion (whole text, and streamed one PDF-sized
+page at a time as ingestion feeds it) and with LangChain's
+``RecursiveCharacterTextSplitter`` configured the way ingestion used to (four
+characters per token), and reports the best-of-``--repeat`` time, MB/s,
+chunk count and the spread of chunk sizes in estimated tokens.
+
+Usage (from ``backend/``):
+
+    python -m benchmarks.chunking --sizes 1024 8192 32768 --repeat 3 --json chunking.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks.ingestion_throughput import paragraphs
+
+# Characters per page of streamed input, about one page of a lecture PDF
+PAGE_CHARS = 3000
+
+
+def strategies(chunk_size: int, chunk_overlap: int) -> dict:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    from app.services.chunking import TokenChunker
+
+    recursive = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size * 4,
+        chunk_overlap=chunk_overlap * 4,
+        length_function=len,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
+    chunker = TokenChunker(chunk_size, chunk_overlap)
+
+    def streamed(text: str) -> list[str]:
+        pages = (text[i : i + PAGE_CHARS] for i in range(0, len(text), PAGE_CHARS))
+        return list(chunker.chunks(pages))
+
+    return {
+        "recursive": recursive.split_text,
+        "token": chunker.split_text,
+        "token-streamed": streamed,
+    }
+
+
+def measure(split, text: str, repeat: int) -> dict:
+    from app.services.chunking import estimate_tokens
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = split(text)
+        best = min(best, time.perf_counter() - start)
+    sizes = sorted(estimate_tokens(chunk) for chunk in chunks)
+    return {
+        "seconds": best,
+        "mb_per_second": len(text) / 1e6 / best,
+        "chunks": len(chunks),
+        "tokens_min": sizes[0],
+        "tokens_p50": sizes[len(sizes) // 2],
+        "tokens_max": sizes[-1],
+        "tokens_stdev": statistics.pstdev(sizes),
+    }
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    results = []
+    for kib in args.sizes:
+        text = "\n\n".join(paragraphs(kib, rng))
+        for name, split in strategies(args.chunk_size, args.chunk_overlap).items():
+            results.append({"strategy": name, "kib": kib, **measure(split, text, args.repeat)})
+
+    print(f"{'strategy':<15} {'KiB':>6} {'seconds':>8} {'MB/s':>7} {'chunks':>7} "
+          f"{'min':>4} {'p50':>4} {'max':>4} {'stdev':>6}")
+    for r in results:
+        print(f"{r['strategy']:<15} {r['kib']:>6} {r['seconds']:>8.3f} {r['mb_per_second']:>7.1f} "
+              f"{r['chunks']:>7} {r['tokens_min']:>4} {r['tokens_p50']:>4} {r['tokens_max']:>4} "
+              f"{r['tokens_stdev']:>6.1f}")
+
+    if args.json:
+        report = {
+            "config": {
+                "sizes_kib": args.sizes,
+                "chunk_size": args.chunk_size,
+                "chunk_overlap": args.chunk_overlap,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 8192, 32768], help="KiB of text per document")
+    parser.add_argument("--chunk-size", type=int, default=128, help="tokens per chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=12, help="tokens of overlap")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per strategy; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the machine-readable report to this file")
+    main(parser.parse_args())
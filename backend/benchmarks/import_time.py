@@ -0,0 +1,134 @@
+"""Import-time benchmark for API worker boot.
+
+Measures, in fresh interpreter processes, how long it takes to import a module
+(``app.main`` by default) and which heavy third-party packages end up loaded as
+a side effect. Optionally compares against another git revision so the effect
+of a change on worker boot time is visible directly.
+
+Usage (from ``backend/``):
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --baseline HEAD~1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = [
+    "langchain_google_genai",
+    "langchain_text_splitters",
+    "langgraph",
+    "pypdf",
+    "docx",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, cwd: Path, runs: int) -> dict:
+    """Import ``module`` in ``runs`` fresh interpreters and summarise timings."""
+    env = {
+        **os.environ,
+        "PYTHONWARNINGS": "ignore",
+        # Older revisions build Gemini clients at import time and need a key
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY") or "benchmark",
+    }
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    samples = []
+    loaded: list[str] = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        loaded = result["loaded"]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "heavy_modules_loaded": loaded,
+    }
+
+
+def measure_revision(revision: str, module: str, runs: int) -> dict:
+    """Measure ``module`` against a detached worktree of ``revision``."""
+    repo_root = BACKEND_DIR.parent
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = Path(tmp) / "worktree"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", str(worktree), revision],
+            cwd=repo_root,
+            capture_output=True,
+            check=True,
+        )
+        try:
+            return measure(module, worktree / "backend", runs)
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(worktree)],
+                cwd=repo_root,
+                capture_output=True,
+            )
+
+
+def _print_result(label: str, result: dict) -> None:
+    loaded = ", ".join(result["heavy_modules_loaded"]) or "none"
+    print(
+        f"{label:<10} import {result['module']}: "
+        f"median {result['median_s'] * 1000:.0f} ms "
+        f"(min {result['min_s'] * 1000:.0f}, max {result['max_s'] * 1000:.0f}, "
+        f"{result['runs']} runs); heavy modules loaded: {loaded}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", help="git revision to compare against")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable output")
+    args = parser.parse_args()
+
+    current = measure(args.module, BACKEND_DIR, args.runs)
+    baseline = measure_revision(args.baseline, args.module, args.runs) if args.baseline else None
+
+    if args.json:
+        print(json.dumps({"current": current, "baseline": baseline}, indent=2))
+        return
+
+    if baseline:
+        _print_result(args.baseline, baseline)
+    _print_result("current", current)
+    if baseline:
+        saved = baseline["median_s"] - current["median_s"]
+        print(f"Reduction: {saved * 1000:.0f} ms ({saved / baseline['median_s']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
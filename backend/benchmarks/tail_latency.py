@@ -0,0 +1,142 @@
+"""Chat turn tail latency with deadline budgets and hedged LLM requests.
+
+Runs chat turns through the conversation graph against the fake provider
+with injected latency: most calls take ``--latency`` seconds (jittered), a
+``--slow-fraction`` of them stall for ``--stall`` seconds. Each
+configuration is run with hedging off and on and reports p50/p95/p99 turn
+latency, how many turns fell back to a degraded reply at the deadline, and how
+many hedge requests were sent. Vector search is stubbed out as well (a turn
+whose routing times out goes to retrieval), so no database or provider
+credentials are needed.
+
+Usage (from ``backend/``):
+
+    python -m benchmarks.tail_latency --turns 400 --concurrency 20 --budget 3
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from langchain_core.messages import HumanMessage
+
+from app.config import get_settings
+from app.graph.graph import PreparedTurn, StudyBuddyGraph
+from app.providers.hedging import get_latency_tracker
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def no_database():
+    yield None
+
+
+async def no_chunks(db, session_id, query, k=5, score_threshold=0.5) -> list:
+    await asyncio.sleep(0.005)
+    return []
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_turn(graph: StudyBuddyGraph, n: int) -> dict:
+    query = HumanMessage(content=f"Explain topic {n}", id=str(uuid.uuid4()))
+    turn = PreparedTurn(
+        config={"configurable": {"thread_id": str(uuid.uuid4())}},
+        turn_input={
+            "user_query": query.content,
+            "session_id": str(uuid.uuid4()),
+            "user_id": str(uuid.uuid4()),
+            "messages": [query],
+            "retrieved_chunks": [],
+            "needs_retrieval": False,
+            "has_context": False,
+            # Documents present, so the router makes an LLM call too
+            "has_documents": True,
+            "response": None,
+            "sources": [],
+            "turn_metrics": {},
+        },
+        query_message_id=query.id,
+        started_at=time.perf_counter(),
+    )
+    return await graph.execute_turn(turn, session_factory=no_database)
+
+
+async def run_mode(graph: StudyBuddyGraph, turns: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(n: int) -> dict:
+        async with semaphore:
+            return await run_turn(graph, n)
+
+    results = await asyncio.gather(*[limited(n) for n in range(turns)])
+    latencies = [r["metrics"]["total_ms"] / 1000 for r in results]
+    steps = [r["metrics"]["steps"] for r in results]
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "mean": statistics.mean(latencies),
+        "degraded": sum(
+            any("degraded" in s.get(step, {}) for step in ("route_query", "generate"))
+            for s in steps
+        ),
+        "hedged": sum(
+            sum("hedge_winner" in s.get(step, {}) for step in ("route_query", "generate"))
+            for s in steps
+        ),
+    }
+
+
+async def main(args) -> None:
+    random.seed(args.seed)
+    settings.LLM_PROVIDER = "fake"
+    settings.FAKE_LLM_LATENCY_SECONDS = args.latency
+    settings.FAKE_LLM_LATENCY_JITTER = 0.5
+    settings.FAKE_LLM_STALL_RATE = args.slow_fraction
+    settings.FAKE_LLM_STALL_SECONDS = args.stall
+    settings.FAKE_LLM_TOKENS_PER_SECOND = 0
+    settings.CHAT_TURN_BUDGET_SECONDS = args.budget
+    settings.ROUTER_TIMEOUT_SECONDS = args.router_timeout
+    graph = StudyBuddyGraph(checkpointer=None)
+    graph.embedding_service.similarity_search = no_chunks
+
+    # Fill the latency window so hedging has a p95 to work from
+    settings.LLM_HEDGING_ENABLED = False
+    await run_mode(graph, settings.LLM_HEDGE_MIN_SAMPLES * 2, args.concurrency)
+
+    print(f"fake LLM latency {args.latency}s, {args.slow_fraction:.0%} stall {args.stall}s, "
+          f"budget {args.budget}s, {args.turns} turns at concurrency {args.concurrency}")
+    print(f"{'hedging':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'mean':>7} {'degraded':>8} {'hedges':>6}")
+    for hedging in (False, True):
+        settings.LLM_HEDGING_ENABLED = hedging
+        r = await run_mode(graph, args.turns, args.concurrency)
+        print(f"{'on' if hedging else 'off':>8} {r['p50']:>7.3f} {r['p95']:>7.3f} "
+              f"{r['p99']:>7.3f} {r['mean']:>7.3f} {r['degraded']:>8} {r['hedged']:>6}")
+    tracker = get_latency_tracker()
+    delays = ", ".join(
+        f"{key} {tracker.quantile(key, settings.LLM_HEDGE_QUANTILE):.3f}s"
+        for key in sorted(tracker.keys())
+    )
+    print(f"hedge delay (p{settings.LLM_HEDGE_QUANTILE * 100:.0f}): {delays}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.1, help="typical LLM call latency")
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--stall", type=float, default=5.0, help="latency of a stalled call")
+    parser.add_argument("--budget", type=float, default=3.0, help="chat turn budget, seconds")
+    parser.add_argument("--router-timeout", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
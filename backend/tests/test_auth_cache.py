@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+
+from app.core import auth_cache
+from app.core.auth_cache import AuthCache, TTLCache, get_auth_cache
+from app.db.models import User
+from app.services.auth import AuthService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDB:
+    """Just enough of an AsyncSession for AuthService.deactivate_user."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth_cache.time, "monotonic", clock)
+    cache = TTLCache(ttl_seconds=30, max_entries=10)
+    cache.set("token", "user")
+    # A shorter TTL (the token's own expiry) wins over the cache's
+    cache.set("short", "user", ttl_seconds=5)
+
+    clock.now += 10
+    assert cache.get("token") == "user"
+    assert cache.get("short") is None
+
+    clock.now += 20
+    assert cache.get("token") is None
+
+
+def test_zero_ttl_stores_nothing_and_oldest_entries_go_first():
+    disabled = TTLCache(ttl_seconds=0, max_entries=10)
+    disabled.set("key", "value")
+    assert disabled.get("key") is None
+
+    cache = TTLCache(ttl_seconds=30, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert [cache.get(key) for key in ("a", "b", "c")] == [None, "b", "c"]
+
+
+def test_forget_session_drops_only_that_session():
+    cache = AuthCache(ttl_seconds=30, max_entries=10)
+    user_id, kept, deleted = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.active_users.set(user_id, True)
+    cache.session_owners.set((user_id, kept), True)
+    cache.session_owners.set((user_id, deleted), True)
+
+    cache.forget_session(deleted)
+
+    assert cache.session_owners.get((user_id, deleted)) is None
+    assert cache.session_owners.get((user_id, kept))
+    assert cache.active_users.get(user_id)
+
+
+def test_deactivating_a_user_forgets_everything_cached_for_them():
+    cache = get_auth_cache()
+    user = User(id=uuid.uuid4(), email="a@example.com", hashed_password="x", is_active=True)
+    other_id, session_id = uuid.uuid4(), uuid.uuid4()
+    cache.tokens.set("user-token", (user.id, False))
+    cache.tokens.set("other-token", (other_id, False))
+    cache.active_users.set(user.id, True)
+    cache.active_users.set(other_id, True)
+    cache.session_owners.set((user.id, session_id), True)
+
+    db = FakeDB()
+    asyncio.run(AuthService.deactivate_user(db, user))
+
+    assert user.is_active is False
+    assert db.commits == 1 and len(db.statements) == 1
+    assert cache.tokens.get("user-token") is None
+    assert cache.active_users.get(user.id) is None
+    assert cache.session_owners.get((user.id, session_id)) is None
+    # Other users keep their entries
+    assert cache.tokens.get("other-token") == (other_id, False)
+    assert cache.active_users.get(other_id)
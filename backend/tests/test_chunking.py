@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app.services.chunking import TokenChunker, estimate_tokens
+
+SIZES = [(30, 10), (100, 20), (256, 64), (50, 0)]
+
+
+def make_text(seed: int, words: int = 3000) -> str:
+    """Prose-like text: mixed word lengths, sentences, lines and paragraphs."""
+    rng = random.Random(seed)
+    parts = []
+    for _ in range(words):
+        length = rng.choice([1, 2, 3, 5, 8, 13, 30])
+        parts.append("".join(rng.choice("abcdefghij") for _ in range(length)))
+        r = rng.random()
+        parts.append(
+            "\n\n" if r < 0.01 else "\n" if r < 0.03 else ". " if r < 0.1 else "  " if r < 0.12 else " "
+        )
+    return "".join(parts)
+
+
+def spans(text: str, chunks: list[str]) -> list[tuple[int, int]]:
+    """Where each chunk lies in the text, in order."""
+    found, position = [], -1
+    for chunk in chunks:
+        position = text.find(chunk, position + 1)
+        assert position >= 0, "chunk is not a stretch of the input"
+        found.append((position, position + len(chunk)))
+    return found
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", SIZES)
+@pytest.mark.parametrize("seed", range(5))
+def test_chunks_cover_the_input_once_within_budget(seed, chunk_size, chunk_overlap):
+    text = make_text(seed)
+    chunks = TokenChunker(chunk_size, chunk_overlap).split_text(text)
+    found = spans(text, chunks)
+
+    assert text[: found[0][0]].strip() == ""
+    assert text[found[-1][1] :].strip() == ""
+    for (start, end), (next_start, next_end) in zip(found, found[1:]):
+        assert start < next_start and end < next_end
+        # No text is skipped between chunks...
+        assert text[end:next_start].strip() == ""
+        # ...and only the overlap is repeated
+        assert estimate_tokens(text[next_start:end]) <= chunk_overlap
+    assert max(map(estimate_tokens, chunks)) <= chunk_size
+
+
+def test_overlap_repeats_the_end_of_the_previous_chunk():
+    text = make_text(seed=7)
+    found = spans(text, TokenChunker(256, 64).split_text(text))
+    overlaps = [estimate_tokens(text[b:end]) for (_, end), (b, _) in zip(found, found[1:])]
+    assert all(0 < overlap <= 64 for overlap in overlaps)
+
+
+def test_pieces_chunk_like_the_whole_text():
+    text = make_text(seed=3)
+    chunker = TokenChunker(100, 20)
+    # Piece boundaries fall mid-word and mid-separator
+    pieces = [text[i : i + 777] for i in range(0, len(text), 777)]
+    assert list(chunker.chunks(pieces)) == chunker.split_text(text)
+
+
+def test_text_within_one_chunk_is_returned_whole():
+    assert TokenChunker(100, 20).split_text("  A short note.\n") == ["A short note."]
+    assert TokenChunker(100, 20).split_text("   \n") == []
+
+
+def test_overlap_must_be_smaller_than_the_chunk():
+    with pytest.raises(ValueError):
+        TokenChunker(50, 50)
@@ -0,0 +1,34 @@
+from app.core.etag import etag_matches, make_etag
+
+ETAG = make_etag("documents", "session", 3)
+
+
+def test_same_parts_give_the_same_strong_tag():
+    assert ETAG == make_etag("documents", "session", 3)
+    assert ETAG != make_etag("documents", "session", 4)
+    assert ETAG.startswith('"') and ETAG.endswith('"')
+
+
+def test_missing_header_never_matches():
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+
+
+def test_exact_and_weak_tags_match():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches(f"W/{ETAG}", ETAG)
+    assert not etag_matches(make_etag("other"), ETAG)
+    # Unquoted values are not the same tag
+    assert not etag_matches(ETAG.strip('"'), ETAG)
+
+
+def test_star_matches_any_tag():
+    assert etag_matches("*", ETAG)
+    assert etag_matches(" * ", ETAG)
+
+
+def test_any_tag_in_a_comma_separated_list_matches():
+    other = make_etag("other")
+    assert etag_matches(f"{other}, {ETAG}", ETAG)
+    assert etag_matches(f"{other},W/{ETAG}", ETAG)
+    assert not etag_matches(f"{other}, W/{make_etag('third')}", ETAG)
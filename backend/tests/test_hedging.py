@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from app.graph.deadline import Deadline
+from app.graph.nodes.generation import GenerationNode
+from app.graph.nodes.router import QueryRouterNode
+from app.providers.fake import FakeChatModel
+from app.providers.hedging import LatencyTracker, hedged
+
+
+class Attempts:
+    """Stub call whose n-th attempt sleeps and then returns or raises."""
+
+    def __init__(self, *outcomes):
+        # (seconds, result or exception) per attempt
+        self.outcomes = outcomes
+        self.started = 0
+        self.cancelled = []
+
+    async def __call__(self):
+        attempt = self.started
+        self.started += 1
+        delay, outcome = self.outcomes[attempt]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(attempt)
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_primary_answering_before_hedge_after_sends_no_hedge():
+    call = Attempts((0.01, "primary"), (0.01, "hedge"))
+    result = asyncio.run(hedged(call, timeout=1, hedge_after=0.2))
+    assert result == ("primary", None)
+    assert call.started == 1
+
+
+def test_faster_hedge_wins_and_the_primary_is_cancelled():
+    call = Attempts((5, "primary"), (0.01, "hedge"))
+
+    async def run():
+        result = await hedged(call, timeout=1, hedge_after=0.02)
+        # Let the cancellation reach the losing attempt
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == ("hedge", "hedge")
+    assert call.started == 2
+    assert call.cancelled == [0]
+
+
+def test_when_both_attempts_fail_the_last_error_is_raised():
+    call = Attempts((0.04, RuntimeError("primary failed")), (0.04, RuntimeError("hedge failed")))
+    with pytest.raises(RuntimeError, match="hedge failed"):
+        asyncio.run(hedged(call, timeout=1, hedge_after=0.01))
+    assert call.started == 2
+
+
+def test_no_answer_within_the_timeout_raises_timeout_error():
+    call = Attempts((5, "primary"), (5, "hedge"))
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await hedged(call, timeout=0.05, hedge_after=0.01)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert call.cancelled == [0, 1]
+    with pytest.raises(TimeoutError):
+        asyncio.run(hedged(call, timeout=0))
+
+
+def test_latency_quantile_needs_enough_samples():
+    tracker = LatencyTracker(window=4)
+    for seconds in (0.5, 0.1, 0.4, 0.2, 0.3):
+        tracker.record("generate", seconds)
+    assert tracker.quantile("generate", 0.5, min_samples=5) is None
+    # The window keeps the last four samples
+    assert tracker.quantile("generate", 0.5) == 0.2
+    assert tracker.quantile("generate", 1.0) == 0.4
+
+
+def slow_model(*args, **kwargs):
+    return FakeChatModel(latency=5)
+
+
+def expired_config() -> dict:
+    return {"configurable": {"deadline": Deadline.after(0.05)}}
+
+
+def test_generation_falls_back_to_the_notes_when_the_deadline_expires(monkeypatch):
+    monkeypatch.setattr(GenerationNode, "llm_for", lambda self, tier: slow_model())
+    chunk = {"id": "c1", "document_name": "bio.pdf", "content": "Light drives it.", "similarity": 0.9}
+    state = {
+        "user_query": "What is photosynthesis?",
+        "messages": [HumanMessage(content="What is photosynthesis?")],
+        "retrieved_chunks": [chunk],
+        "has_context": True,
+    }
+
+    result = asyncio.run(GenerationNode()(state, expired_config()))
+
+    assert result["node_metrics"]["degraded"] == "deadline"
+    assert "[bio.pdf]: Light drives it." in result["response"]
+    assert result["sources"][0]["chunk_id"] == "c1"
+
+
+def test_router_retrieves_when_the_deadline_expires(monkeypatch):
+    monkeypatch.setattr(QueryRouterNode, "llm", property(slow_model))
+    state = {"user_query": "hi", "has_documents": True}
+
+    result = asyncio.run(QueryRouterNode()(state, expired_config()))
+
+    assert result["needs_retrieval"] is True
+    assert result["node_metrics"]["degraded"] == "deadline"
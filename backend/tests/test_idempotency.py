@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from app.core.idempotency import IdempotencyKeyConflict, IdempotencyStore
+
+
+class CountingWork:
+    """Work that records its runs and finishes when released."""
+
+    def __init__(self, result="done"):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.result
+
+
+def test_concurrent_duplicates_share_one_execution():
+    async def run():
+        store = IdempotencyStore(ttl_seconds=60)
+        work = CountingWork()
+        first = asyncio.create_task(store.run("key", "fp", work))
+        second = asyncio.create_task(store.run("key", "fp", work))
+        await asyncio.sleep(0)
+        work.release.set()
+        assert await first == ("done", False)
+        assert await second == ("done", True)
+        assert work.calls == 1
+
+    asyncio.run(run())
+
+
+def test_finished_work_is_replayed_until_it_expires():
+    async def run():
+        store = IdempotencyStore(ttl_seconds=60)
+        work = CountingWork()
+        work.release.set()
+        assert await store.run("key", "fp", work) == ("done", False)
+        assert await store.run("key", "fp", work) == ("done", True)
+        assert work.calls == 1
+
+        store.ttl_seconds = 0
+        await store.run("other", "fp", work)
+        # Expired entries are forgotten: the key runs afresh
+        assert await store.run("other", "fp", work) == ("done", False)
+
+    asyncio.run(run())
+
+
+def test_key_reused_for_a_different_request_conflicts():
+    async def run():
+        store = IdempotencyStore(ttl_seconds=60)
+        work = CountingWork()
+        work.release.set()
+        await store.run("key", "fp", work)
+        with pytest.raises(IdempotencyKeyConflict):
+            await store.run("key", "other-fp", work)
+        assert work.calls == 1
+
+    asyncio.run(run())
+
+
+def test_failed_work_is_forgotten_so_a_retry_runs_it_again():
+    async def run():
+        store = IdempotencyStore(ttl_seconds=60)
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("storage unavailable")
+            return "saved"
+
+        with pytest.raises(RuntimeError):
+            await store.run("key", "fp", flaky)
+        await asyncio.sleep(0)
+        assert await store.run("key", "fp", flaky) == ("saved", False)
+        assert attempts == 2
+
+    asyncio.run(run())
@@ -0,0 +1,126 @@
+import asyncio
+
+from app.providers.scheduler import INGESTION, INTERACTIVE, ROUTING, ProviderScheduler
+
+
+def make_scheduler(quota_per_minute: int, reserve: float = 0.2) -> ProviderScheduler:
+    return ProviderScheduler(
+        max_concurrency=8,
+        class_limits={INTERACTIVE: 8, ROUTING: 4, INGESTION: 2},
+        quota_per_minute=quota_per_minute,
+        ingestion_quota_reserve=reserve,
+    )
+
+
+async def admit(scheduler: ProviderScheduler, priority: str, cost: int) -> None:
+    async def enter():
+        async with scheduler.slot(priority, cost=cost):
+            pass
+
+    await asyncio.wait_for(enter(), timeout=1)
+
+
+def test_ingestion_batch_larger_than_its_share_is_admitted():
+    async def run():
+        scheduler = make_scheduler(quota_per_minute=100)
+        await admit(scheduler, INGESTION, cost=100)
+        # Charged only the share ingestion may use, so the reserve is intact
+        assert scheduler.stats()["quota_available"] == 20
+        await admit(scheduler, INTERACTIVE, cost=1)
+
+    asyncio.run(run())
+
+
+def test_ingestion_waits_rather_than_spending_the_reserve():
+    async def run():
+        scheduler = make_scheduler(quota_per_minute=100)
+        await admit(scheduler, INGESTION, cost=80)
+        try:
+            # Ten units take six seconds to refill
+            await admit(scheduler, INGESTION, cost=10)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("ingestion spent the reserved quota")
+        assert scheduler.stats()["classes"][INGESTION]["queued"] == 0
+
+    asyncio.run(run())
+
+
+def test_oversized_interactive_request_is_admitted():
+    async def run():
+        scheduler = make_scheduler(quota_per_minute=10)
+        await admit(scheduler, INTERACTIVE, cost=50)
+        assert scheduler.stats()["quota_available"] == 0
+
+    asyncio.run(run())
+
+
+def test_unlimited_quota():
+    async def run():
+        scheduler = make_scheduler(quota_per_minute=0)
+        for _ in range(3):
+            await admit(scheduler, INGESTION, cost=1000)
+        assert scheduler.stats()["quota_available"] is None
+
+    asyncio.run(run())
+
+
+async def hold(scheduler: ProviderScheduler, priority: str, order: list | None = None):
+    """Start a request that keeps its slot until the returned event is set."""
+    done = asyncio.Event()
+
+    async def body():
+        async with scheduler.slot(priority):
+            if order is not None:
+                order.append(priority)
+            await done.wait()
+
+    task = asyncio.create_task(body())
+    await asyncio.sleep(0)
+    return task, done
+
+
+def test_interactive_is_uncapped_while_routing_and_ingestion_are_saturated():
+    async def run():
+        scheduler = ProviderScheduler(
+            max_concurrency=0,
+            class_limits={INTERACTIVE: 0, ROUTING: 4, INGESTION: 2},
+        )
+        background = [await hold(scheduler, ROUTING) for _ in range(6)]
+        background += [await hold(scheduler, INGESTION) for _ in range(4)]
+        chats = [await hold(scheduler, INTERACTIVE) for _ in range(50)]
+        classes = scheduler.stats()["classes"]
+        assert classes[INTERACTIVE]["in_flight"] == 50
+        assert classes[ROUTING]["queued"] == 2 and classes[INGESTION]["queued"] == 2
+
+        for task, done in chats + background:
+            done.set()
+        await asyncio.gather(*(task for task, _ in chats + background))
+
+    asyncio.run(run())
+
+
+def test_interactive_gets_the_next_free_slot_under_a_global_cap():
+    async def run():
+        scheduler = ProviderScheduler(
+            max_concurrency=2,
+            class_limits={INTERACTIVE: 0, ROUTING: 4, INGESTION: 2},
+        )
+        order: list = []
+        holders = [await hold(scheduler, INGESTION), await hold(scheduler, ROUTING)]
+        queued = [await hold(scheduler, INGESTION, order), await hold(scheduler, ROUTING, order)]
+        chat = await hold(scheduler, INTERACTIVE, order)
+
+        holders[0][1].set()
+        await holders[0][0]
+        await asyncio.sleep(0)
+        # Queued after routing and ingestion, admitted before both
+        assert order == [INTERACTIVE]
+
+        for task, done in holders + queued + [chat]:
+            done.set()
+        await asyncio.gather(*(task for task, _ in holders + queued + [chat]))
+        assert order == [INTERACTIVE, ROUTING, INGESTION]
+
+    asyncio.run(run())
@@ -14,9 +14,12 @@ export async function getMessages(
 }
 
 export async function sendMessage(sessionId: string, content: string): Promise<ChatResponse> {
-  const response = await apiClient.post<ChatResponse>(`/sessions/${sessionId}/chat`, {
-    content,
-  });
+  // One key per message so client retries never trigger a second generation
+  const response = await apiClient.post<ChatResponse>(
+    `/sessions/${sessionId}/chat`,
+    { content },
+    { headers: { 'Idempotency-Key': crypto.randomUUID() } }
+  );
   return response.data;
 }
 
@@ -21,6 +21,44 @@ const apiClient = axios.create({
   },
 });
 
+// In-flight refresh, shared by every request that got a 401 meanwhile
+let refreshing: Promise<string | null> | null = null;
+
+/**
+ * Exchange the refresh token for a new access token
+ *
+ * Concurrent callers share one refresh. If there is no refresh token or it
+ * is rejected, the tokens are cleared, the user is sent to the login page
+ * and this resolves to null.
+ */
+export function refreshAccessToken(): Promise<string | null> {
+  if (!refreshing) {
+    refreshing = (async () => {
+      const refreshToken = localStorage.getItem('refresh_token');
+      if (refreshToken) {
+        try {
+          const response = await axios.post(`${API_BASE_URL}/auth/refresh`, {
+            refresh_token: refreshToken,
+          });
+
+          const { access_token } = response.data;
+          localStorage.setItem('access_token', access_token);
+          return access_token as string;
+        } catch {
+          // Refresh failed, clear tokens and redirect to login
+          localStorage.removeItem('refresh_token');
+        }
+      }
+      localStorage.removeItem('access_token');
+      window.location.href = '/login';
+      return null;
+    })().finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+}
+
 // Request interceptor - add auth token
 apiClient.interceptors.request.use((config: InternalAxiosRequestConfig) => {
   const token = localStorage.getItem('access_token');
@@ -40,29 +78,12 @@ apiClient.interceptors.response.use(
     if (error.response?.status === 401 && originalRequest && !originalRequest._retry) {
       originalRequest._retry = true;
 
-      const refreshToken = localStorage.getItem('refresh_token');
-      if (refreshToken) {
-        try {
-          const response = await axios.post(`${API_BASE_URL}/auth/refresh`, {
-            refresh_token: refreshToken,
-          });
-
-          const { access_token } = response.data;
-          localStorage.setItem('access_token', access_token);
-
-          if (originalRequest.headers) {
-            originalRequest.headers.Authorization = `Bearer ${access_token}`;
-          }
-          return apiClient(originalRequest);
-        } catch {
-          // Refresh failed, clear tokens and redirect to login
-          localStorage.removeItem('access_token');
-          localStorage.removeItem('refresh_token');
-          window.location.href = '/login';
+      const accessToken = await refreshAccessToken();
+      if (accessToken) {
+        if (originalRequest.headers) {
+          originalRequest.headers.Authorization = `Bearer ${accessToken}`;
         }
-      } else {
-        localStorage.removeItem('access_token');
-        window.location.href = '/login';
+        return apiClient(originalRequest);
       }
     }
 
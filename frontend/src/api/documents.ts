@@ -15,6 +15,8 @@ export async function uploadDocument(
     {
       headers: {
         'Content-Type': 'multipart/form-data',
+        // One key per upload so client retries never ingest the file twice
+        'Idempotency-Key': crypto.randomUUID(),
       },
       onUploadProgress: (progressEvent) => {
         if (onProgress && progressEvent.total) {
@@ -1,5 +1,12 @@
 import apiClient from './client';
-import type { Session, SessionCreate, SessionUpdate, SessionListResponse } from '../types';
+import type {
+  Session,
+  SessionCreate,
+  SessionUpdate,
+  SessionListResponse,
+  SessionDashboardResponse,
+  SessionChangesResponse,
+} from '../types';
 
 export async function getSessions(
   skip = 0,
@@ -12,11 +19,34 @@ export async function getSessions(
   return response.data;
 }
 
+export async function getDashboard(
+  limit = 20,
+  includeArchived = false
+): Promise<SessionDashboardResponse> {
+  // Sessions with their document, note and message counts
+  const response = await apiClient.get<SessionDashboardResponse>('/sessions/dashboard', {
+    params: { limit, include_archived: includeArchived },
+  });
+  return response.data;
+}
+
 export async function getSession(sessionId: string): Promise<Session> {
   const response = await apiClient.get<Session>(`/sessions/${sessionId}`);
   return response.data;
 }
 
+export async function getSessionChanges(
+  sessionId: string,
+  since: string | null = null,
+  limit = 200
+): Promise<SessionChangesResponse> {
+  // Without a cursor this is a full load; with one, only what changed since
+  const response = await apiClient.get<SessionChangesResponse>(`/sessions/${sessionId}/changes`, {
+    params: { limit, ...(since ? { since } : {}) },
+  });
+  return response.data;
+}
+
 export async function createSession(data: SessionCreate): Promise<Session> {
   const response = await apiClient.post<Session>('/sessions', data);
   return response.data;
@@ -9,13 +9,13 @@ interface ChatWindowProps {
 }
 
 export const ChatWindow: React.FC<ChatWindowProps> = ({ sessionId }) => {
-  const { messages, isLoading, isSending, loadMessages, sendMessage, reset } = useChatStore();
+  const { messages, isLoading, isSending, loadMessages, sendMessage } = useChatStore();
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
+  // Messages stay cached after unmount so reopening the session is a delta sync
   useEffect(() => {
     loadMessages(sessionId);
-    return () => reset();
-  }, [sessionId, loadMessages, reset]);
+  }, [sessionId, loadMessages]);
 
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -1,9 +1,10 @@
 import React, { useEffect } from 'react';
 import { useDocumentStore } from '../../stores/documentStore';
+import { useChatStore } from '../../stores/chatStore';
 import { Button } from '../ui/Button';
 import { Loading } from '../ui/Loading';
-import type { Document } from '../../types';
-import { useSmartPolling } from '../../hooks/useSmartPolling';
+import type { Document, DocumentEvent } from '../../types';
+import { useDocumentEvents } from '../../hooks/useDocumentEvents';
 
 interface DocumentListProps {
   sessionId: string;
@@ -31,30 +32,30 @@ const formatFileSize = (bytes: number): string => {
 };
 
 export const DocumentList: React.FC<DocumentListProps> = ({ sessionId }) => {
-  const { documents, isLoading, loadDocuments, deleteDocument, refreshDocumentStatus } =
+  const { documents, isLoading, loadDocuments, deleteDocument, applyDocumentEvent } =
     useDocumentStore();
+  const syncSession = useChatStore((state) => state.syncSession);
 
   useEffect(() => {
     loadDocuments(sessionId);
   }, [sessionId, loadDocuments]);
 
-  // Filter documents that need polling
-  const processingDocs = documents.filter(
-    (d) => d.processing_status === 'pending' || d.processing_status === 'processing'
-  );
-
-  // Smart polling with adaptive backoff
-  useSmartPolling({
-    baseInterval: 3000, // 3 seconds
-    maxInterval: 30000, // 30 seconds max
-    onPoll: async () => {
-      // Poll all processing documents in parallel
-      await Promise.all(
-        processingDocs.map((doc) => refreshDocumentStatus(doc.id))
-      );
+  // Status and progress are pushed by the server; a (re)connect resyncs
+  // whatever changed while the stream was down
+  useDocumentEvents(
+    sessionId,
+    (event: DocumentEvent) => {
+      if (documents.some((d) => d.id === event.document_id)) {
+        applyDocumentEvent(event);
+      } else {
+        // Uploaded elsewhere (another tab or device)
+        syncSession(sessionId).catch(() => undefined);
+      }
     },
-    enabled: processingDocs.length > 0,
-  });
+    () => {
+      syncSession(sessionId).catch(() => undefined);
+    }
+  );
 
   const handleDelete = async (documentId: string) => {
     if (window.confirm('Are you sure you want to delete this document?')) {
@@ -109,6 +110,13 @@ export const DocumentList: React.FC<DocumentListProps> = ({ sessionId }) => {
                   {formatFileSize(doc.file_size)}
                 </span>
                 <StatusBadge status={doc.processing_status} />
+                {doc.processing_status === 'processing' && doc.progress?.stage && (
+                  <span className="text-xs text-gray-500">
+                    {doc.progress.stage === 'embed' && doc.progress.chunks
+                      ? `embedding ${doc.progress.embedded ?? 0}/${doc.progress.chunks}`
+                      : doc.progress.stage}
+                  </span>
+                )}
                 {doc.processing_status === 'completed' && doc.chunk_count > 0 && (
                   <span className="text-xs text-gray-500">
                     {doc.chunk_count} chunks
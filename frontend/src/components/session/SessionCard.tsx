@@ -9,6 +9,9 @@ interface SessionCardProps {
 
 export const SessionCard: React.FC<SessionCardProps> = ({ session }) => {
   const navigate = useNavigate();
+  const { stats } = session;
+
+  const plural = (count: number, noun: string) => `${count} ${noun}${count === 1 ? '' : 's'}`;
 
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('en-US', {
@@ -46,8 +49,24 @@ export const SessionCard: React.FC<SessionCardProps> = ({ session }) => {
             </span>
           )}
         </div>
+        {stats && (
+          <div className="mt-3 flex flex-wrap gap-x-3 gap-y-1 text-xs text-gray-600">
+            <span>{plural(stats.document_count, 'document')}</span>
+            <span>{plural(stats.note_count, 'note')}</span>
+            <span>{plural(stats.message_count, 'message')}</span>
+            {stats.processing_document_count > 0 && (
+              <span className="text-yellow-700">
+                {stats.processing_document_count} processing
+              </span>
+            )}
+            {stats.failed_document_count > 0 && (
+              <span className="text-red-600">{stats.failed_document_count} failed</span>
+            )}
+          </div>
+        )}
         <div className="mt-3 text-xs text-gray-500">
           Created {formatDate(session.created_at)}
+          {stats?.last_message_at && ` · Last message ${formatDate(stats.last_message_at)}`}
         </div>
       </CardBody>
     </Card>
@@ -0,0 +1,91 @@
+import { useEffect, useRef } from 'react';
+import { refreshAccessToken } from '../api/client';
+import type { DocumentEvent } from '../types';
+
+const RECONNECT_DELAY = 1000;
+const MAX_RECONNECT_DELAY = 30000;
+
+/**
+ * Subscribe to a session's document event stream (server-sent events)
+ *
+ * - Uses fetch rather than EventSource so the bearer token goes in a header
+ * - On a 401, refreshes the access token as the API client does and
+ *   reconnects at once; a second 401 in a row backs off like any failure
+ * - Calls onConnect on every (re)connect so callers can resync anything
+ *   missed while disconnected
+ * - Reconnects with exponential backoff and closes on unmount
+ *
+ * @param sessionId - Session whose documents to follow
+ * @param onEvent - Called for each document event
+ * @param onConnect - Called once the stream is open
+ */
+export function useDocumentEvents(
+  sessionId: string,
+  onEvent: (event: DocumentEvent) => void,
+  onConnect: () => void
+) {
+  // Latest callbacks, so the stream isn't reopened when they change
+  const onEventRef = useRef(onEvent);
+  const onConnectRef = useRef(onConnect);
+  onEventRef.current = onEvent;
+  onConnectRef.current = onConnect;
+
+  useEffect(() => {
+    const controller = new AbortController();
+    let delay = RECONNECT_DELAY;
+    // Whether the last attempt was already made with a fresh token
+    let refreshed = false;
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const token = localStorage.getItem('access_token');
+          const response = await fetch(`/api/v1/sessions/${sessionId}/documents/events`, {
+            headers: token ? { Authorization: `Bearer ${token}` } : {},
+            signal: controller.signal,
+          });
+          if (response.status === 401 && !refreshed) {
+            refreshed = true;
+            // Redirects to login itself when the session can't be renewed
+            if (await refreshAccessToken()) continue;
+            return;
+          }
+          if (!response.ok || !response.body) {
+            throw new Error(`Event stream failed: ${response.status}`);
+          }
+
+          delay = RECONNECT_DELAY;
+          refreshed = false;
+          onConnectRef.current();
+
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = '';
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            // Events are separated by a blank line; keep any partial one
+            const blocks = buffer.split('\n\n');
+            buffer = blocks.pop() ?? '';
+            for (const block of blocks) {
+              const data = block
+                .split('\n')
+                .filter((line) => line.startsWith('data: '))
+                .map((line) => line.slice(6))
+                .join('\n');
+              if (data) onEventRef.current(JSON.parse(data) as DocumentEvent);
+            }
+          }
+        } catch (error) {
+          if (controller.signal.aborted) return;
+          console.warn('[Document events] Stream interrupted, reconnecting', error);
+        }
+        await new Promise((resolve) => setTimeout(resolve, delay));
+        delay = Math.min(delay * 2, MAX_RECONNECT_DELAY);
+      }
+    };
+
+    connect();
+    return () => controller.abort();
+  }, [sessionId]);
+}
@@ -1,37 +1,79 @@
 import { create } from 'zustand';
 import * as chatApi from '../api/chat';
+import * as sessionApi from '../api/sessions';
 import type { Message } from '../types';
 import { extractErrorMessage } from '../utils/errorHandler';
+import { useDocumentStore } from './documentStore';
 
 interface ChatState {
   messages: Message[];
   isLoading: boolean;
   isSending: boolean;
   error: string | null;
+  // Session the messages belong to and the server cursor they are synced up to
+  sessionId: string | null;
+  syncCursor: string | null;
 
   loadMessages: (sessionId: string) => Promise<void>;
+  syncSession: (sessionId: string) => Promise<void>;
   sendMessage: (sessionId: string, content: string) => Promise<void>;
   clearMessages: (sessionId: string) => Promise<void>;
   clearError: () => void;
   reset: () => void;
 }
 
-export const useChatStore = create<ChatState>((set) => ({
+export const useChatStore = create<ChatState>((set, get) => ({
   messages: [],
   isLoading: false,
   isSending: false,
   error: null,
+  sessionId: null,
+  syncCursor: null,
 
   loadMessages: async (sessionId) => {
-    set({ isLoading: true, error: null });
+    // Reopening the same session only fetches what changed since the last sync
+    const cached = get().sessionId === sessionId && get().messages.length > 0;
+    set({ isLoading: !cached, error: null });
     try {
-      const response = await chatApi.getMessages(sessionId, 0, 200);
-      set({ messages: response.messages, isLoading: false });
+      await get().syncSession(sessionId);
+      set({ isLoading: false });
     } catch (err: any) {
       set({ error: extractErrorMessage(err), isLoading: false });
     }
   },
 
+  syncSession: async (sessionId) => {
+    if (get().sessionId !== sessionId) {
+      set({ messages: [], sessionId, syncCursor: null });
+    }
+    let hasMore = true;
+    while (hasMore && get().sessionId === sessionId) {
+      const since = get().syncCursor;
+      let changes;
+      try {
+        changes = await sessionApi.getSessionChanges(sessionId, since);
+      } catch (err: any) {
+        // A cursor the server no longer accepts: start over with a full load
+        if (since === null || err?.response?.status !== 400) throw err;
+        set({ syncCursor: null });
+        continue;
+      }
+      if (get().sessionId !== sessionId) return;
+
+      // A full load (first sync, or after something was deleted) replaces
+      // the cache; a delta is merged into it by id
+      const kept = changes.full ? [] : get().messages;
+      const known = new Set(kept.map((m) => m.id));
+      set({
+        messages: [...kept, ...changes.messages.filter((m) => !known.has(m.id))],
+        syncCursor: changes.cursor,
+      });
+      // The same response carries the session's document changes
+      useDocumentStore.getState().mergeDocuments(changes.documents, changes.full);
+      hasMore = changes.has_more;
+    }
+  },
+
   sendMessage: async (sessionId, content) => {
     // Optimistic update - add user message immediately
     const tempUserMessage: Message = {
@@ -96,5 +138,13 @@ export const useChatStore = create<ChatState>((set) => ({
 
   clearError: () => set({ error: null }),
 
-  reset: () => set({ messages: [], isLoading: false, isSending: false, error: null }),
+  reset: () =>
+    set({
+      messages: [],
+      isLoading: false,
+      isSending: false,
+      error: null,
+      sessionId: null,
+      syncCursor: null,
+    }),
 }));
@@ -1,6 +1,6 @@
 import { create } from 'zustand';
 import * as documentApi from '../api/documents';
-import type { Document } from '../types';
+import type { Document, DocumentEvent } from '../types';
 import { extractErrorMessage } from '../utils/errorHandler';
 
 interface DocumentState {
@@ -12,7 +12,8 @@ interface DocumentState {
   loadDocuments: (sessionId: string) => Promise<void>;
   uploadDocument: (sessionId: string, file: File) => Promise<Document>;
   deleteDocument: (documentId: string) => Promise<void>;
-  refreshDocumentStatus: (documentId: string) => Promise<void>;
+  mergeDocuments: (documents: Document[], replace?: boolean) => void;
+  applyDocumentEvent: (event: DocumentEvent) => void;
   clearError: () => void;
   reset: () => void;
 }
@@ -65,24 +66,34 @@ export const useDocumentStore = create<DocumentState>((set) => ({
     }
   },
 
-  refreshDocumentStatus: async (documentId) => {
-    try {
-      const status = await documentApi.getDocumentStatus(documentId);
-      set((state) => ({
-        documents: state.documents.map((d) =>
-          d.id === documentId
-            ? {
-                ...d,
-                processing_status: status.processing_status as Document['processing_status'],
-                processing_error: status.processing_error,
-                chunk_count: status.chunk_count,
-              }
-            : d
+  mergeDocuments: (documents, replace = false) => {
+    set((state) => {
+      const changed = new Map(documents.map((d) => [d.id, d]));
+      const kept = replace ? [] : state.documents.filter((d) => !changed.has(d.id));
+      return {
+        documents: [...documents, ...kept].sort((a, b) =>
+          b.created_at.localeCompare(a.created_at)
         ),
-      }));
-    } catch {
-      // Ignore status refresh errors
-    }
+      };
+    });
+  },
+
+  applyDocumentEvent: (event) => {
+    set((state) => ({
+      documents: state.documents.map((d) =>
+        d.id === event.document_id
+          ? {
+              ...d,
+              processing_status: event.processing_status,
+              processing_error: event.processing_error,
+              chunk_count: event.chunk_count,
+              progress: event.stage
+                ? { stage: event.stage, embedded: event.embedded, chunks: event.chunks }
+                : undefined,
+            }
+          : d
+      ),
+    }));
   },
 
   clearError: () => set({ error: null }),
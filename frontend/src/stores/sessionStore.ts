@@ -29,8 +29,8 @@ export const useSessionStore = create<SessionState>((set) => ({
   loadSessions: async (includeArchived = false) => {
     set({ isLoading: true, error: null });
     try {
-      const response = await sessionApi.getSessions(0, 100, includeArchived);
-      set({ sessions: response.sessions, total: response.total, isLoading: false });
+      const response = await sessionApi.getDashboard(100, includeArchived);
+      set({ sessions: response.sessions, total: response.total ?? response.sessions.length, isLoading: false });
     } catch (err: any) {
       set({ error: extractErrorMessage(err), isLoading: false });
     }
@@ -67,7 +67,7 @@ export const useSessionStore = create<SessionState>((set) => ({
     try {
       const updated = await sessionApi.updateSession(sessionId, data);
       set((state) => ({
-        sessions: state.sessions.map((s) => (s.id === sessionId ? updated : s)),
+        sessions: state.sessions.map((s) => (s.id === sessionId ? { ...s, ...updated } : s)),
         currentSession: state.currentSession?.id === sessionId ? updated : state.currentSession,
         isLoading: false,
       }));
@@ -98,7 +98,7 @@ export const useSessionStore = create<SessionState>((set) => ({
     try {
       const updated = await sessionApi.archiveSession(sessionId, archive);
       set((state) => ({
-        sessions: state.sessions.map((s) => (s.id === sessionId ? updated : s)),
+        sessions: state.sessions.map((s) => (s.id === sessionId ? { ...s, ...updated } : s)),
         currentSession: state.currentSession?.id === sessionId ? updated : state.currentSession,
         isLoading: false,
       }));
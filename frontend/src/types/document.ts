@@ -10,11 +10,14 @@ export interface Document {
   chunk_count: number;
   created_at: string;
   updated_at: string;
+  // Client-side only: latest progress event while processing
+  progress?: Pick<DocumentEvent, 'stage' | 'embedded' | 'chunks'>;
 }
 
 export interface DocumentListResponse {
   documents: Document[];
   total: number;
+  next_cursor: string | null;
 }
 
 export interface DocumentStatusResponse {
@@ -23,3 +26,15 @@ export interface DocumentStatusResponse {
   processing_error: string | null;
   chunk_count: number;
 }
+
+// Pushed on the session's document event stream while a document is processed
+export interface DocumentEvent {
+  session_id: string;
+  document_id: string;
+  processing_status: Document['processing_status'];
+  processing_error: string | null;
+  chunk_count: number;
+  stage?: 'extract' | 'embed' | 'store';
+  embedded?: number;
+  chunks?: number;
+}
@@ -23,4 +23,5 @@ export interface ChatResponse {
 export interface MessageListResponse {
   messages: Message[];
   total: number;
+  next_cursor: string | null;
 }
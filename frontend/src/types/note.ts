@@ -22,4 +22,5 @@ export interface NoteUpdate {
 export interface NoteListResponse {
   notes: Note[];
   total: number;
+  next_cursor: string | null;
 }
@@ -1,3 +1,6 @@
+import type { Document } from './document';
+import type { Message } from './message';
+
 export interface Session {
   id: string;
   user_id: string;
@@ -7,6 +10,18 @@ export interface Session {
   is_archived: boolean;
   created_at: string;
   updated_at: string;
+  // Only on sessions loaded through the dashboard endpoint
+  stats?: SessionStats;
+}
+
+export interface SessionStats {
+  document_count: number;
+  completed_document_count: number;
+  processing_document_count: number;
+  failed_document_count: number;
+  note_count: number;
+  message_count: number;
+  last_message_at: string | null;
 }
 
 export interface SessionCreate {
@@ -25,4 +40,20 @@ export interface SessionUpdate {
 export interface SessionListResponse {
   sessions: Session[];
   total: number;
+  next_cursor: string | null;
+}
+
+export interface SessionDashboardResponse {
+  sessions: (Session & { stats: SessionStats })[];
+  total: number | null;
+  next_cursor: string | null;
+}
+
+export interface SessionChangesResponse {
+  messages: Message[];
+  documents: Document[];
+  cursor: string;
+  has_more: boolean;
+  // Replace the cached messages and documents instead of merging
+  full: boolean;
 }